@@ -31,6 +31,7 @@
 
           propagatedBuildInputs = [
             pkgs.python3Packages.typer
+            pkgs.python3Packages.orjson
           ];
 
           meta = with pkgs.lib; {
@@ -1,133 +1,255 @@
 """
 Search cache module for Mixtura.
 
-Provides caching for package searches with 5-minute TTL using JSON.
-Cache files are stored in $HOME/mixtura/cache/.
+Provides caching for package searches with 5-minute TTL using JSON (via orjson).
+Cache files are stored in $HOME/mixtura/cache/<provider>/, one file per query.
+Installed-package snapshots live in $HOME/mixtura/cache/installed/<provider>.json.
 """
 
-import json
+import hashlib
+import mmap
+import os
+import shutil
 import time
 from pathlib import Path
-from typing import List, Optional, Any, Dict, cast
+from typing import List, Optional, Any, Dict, Tuple, cast
+
+import orjson
 
 from mixtura.core.package import Package
 
 
+def _write_atomic(path: Path, data: bytes) -> None:
+    """
+    Write a cache file through a temporary file and a rename.
+
+    Readers (and concurrent invocations) never see a partial file. Write
+    errors are ignored: a cache that can't be written is simply not used.
+    """
+    tmp = path.with_name(f"{path.name}.tmp.{os.getpid()}")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except IOError:
+        tmp.unlink(missing_ok=True)
+
+
+def _inside_cache_dir(path: Path) -> bool:
+    """
+    Check that a path resolves strictly inside SearchCache.CACHE_DIR.
+
+    Provider names come from the command line, so a name like ".." or "/"
+    must never turn a cache path into something else on disk.
+    """
+    return SearchCache.CACHE_DIR.resolve() in path.resolve().parents
+
+
 class SearchCache:
     """
     Cache de busca com expiração de 5 minutos.
-    
-    Cada provider tem seu próprio arquivo de cache.
-    O cache armazena {query: {"timestamp": float, "results": [...]}}
+
+    Cada provider tem seu próprio diretório de cache, com um arquivo por query.
+    Cada arquivo armazena a lista de resultados; o mtime do arquivo marca quando
+    a entrada foi gravada.
     """
-    
+
     CACHE_DIR = Path.home() / "mixtura" / "cache"
     TTL_SECONDS = 300  # 5 minutos
-    
+    MMAP_THRESHOLD = 1 << 20  # Entradas a partir de 1 MiB são lidas via mmap
+
+    # Entradas já lidas ou gravadas neste processo: {path: (mtime, results)}.
+    # Compartilhado entre instâncias, já que cada busca cria seu próprio SearchCache.
+    _memory: Dict[Path, Tuple[float, List[Package]]] = {}
+
     def __init__(self, provider_name: str):
         """
         Initialize cache for a specific provider.
-        
+
         Args:
             provider_name: Name of the provider (e.g., 'nixpkgs', 'flatpak')
         """
         self.provider_name = provider_name
-        self.cache_file = self.CACHE_DIR / f"{provider_name}_search.json"
+        self.cache_dir = self.CACHE_DIR / provider_name
         self._ensure_cache_dir()
-    
+
     def _ensure_cache_dir(self) -> None:
-        """Create cache directory if it doesn't exist."""
-        self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    
-    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
-        """Load cache from disk."""
-        if not self.cache_file.exists():
-            return {}
+        """Create cache directory if it doesn't exist (and lies inside CACHE_DIR)."""
+        if _inside_cache_dir(self.cache_dir):
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, query: str) -> Path:
+        """Return the file that holds the cached results for a query."""
+        digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _entry_mtime(self, path: Path) -> Optional[float]:
+        """Return an entry's mtime, or None if it doesn't exist."""
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                return cast(Dict[str, Dict[str, Any]], json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return {}
-    
-    def _save_cache(self, cache: Dict[str, Dict[str, Any]]) -> None:
-        """Save cache to disk."""
+            return path.stat().st_mtime
+        except OSError:
+            return None
+
+    def _is_expired(self, path: Path, current_time: float) -> bool:
+        """Check an entry's age from its mtime. Missing entries count as expired."""
+        mtime = self._entry_mtime(path)
+        return mtime is None or current_time - mtime > self.TTL_SECONDS
+
+    def _load_entry(self, path: Path) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load a single cache entry from disk.
+
+        Large entries (e.g. broad `nix search` results) are parsed straight from
+        a read-only memory map instead of being copied into a bytes object first.
+        """
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache, f, ensure_ascii=False, indent=2)
-        except IOError:
-            pass  # Silently fail if we can't write cache
-    
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < self.MMAP_THRESHOLD:
+                    return cast(List[Dict[str, Any]], orjson.loads(f.read()))
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as view:
+                        return cast(List[Dict[str, Any]], orjson.loads(view))
+        except (orjson.JSONDecodeError, ValueError, IOError):
+            return None
+
+    def _save_entry(self, path: Path, entry: List[Dict[str, Any]]) -> None:
+        """
+        Save a single cache entry to disk.
+
+        The entry is written to a temporary file next to it and renamed into
+        place, so readers (and concurrent invocations) never see a partial file.
+        """
+        _write_atomic(path, orjson.dumps(entry))
+
     def _serialize_results(self, results: List[Package]) -> List[Dict[str, Any]]:
         """Convert Package objects to JSON-serializable dicts."""
-        return [pkg.to_dict() for pkg in results]
-    
+        return list(map(Package.to_dict, results))
+
     def _deserialize_results(self, data: List[Dict[str, Any]]) -> List[Package]:
         """Convert dicts back to Package objects."""
-        return [Package.from_dict(item) for item in data]
-    
+        return list(map(Package.from_dict, data))
+
     def get(self, query: str) -> Optional[List[Package]]:
         """
         Get cached results if valid (not expired).
-        
+
         Args:
             query: Search query string
-            
+
         Returns:
             Cached results if valid, None if expired or not found
         """
-        cache = self._load_cache()
-        
-        if query not in cache:
-            return None
-        
-        entry = cache[query]
-        timestamp = entry.get("timestamp", 0)
-        results_data = entry.get("results", [])
+        path = self._entry_path(query)
         current_time = time.time()
-        
-        if current_time - timestamp > self.TTL_SECONDS:
-            # Cache expired, remove entry
-            del cache[query]
-            self._save_cache(cache)
+
+        # Already decoded earlier in this process
+        memo = self._memory.get(path)
+        if memo is not None and current_time - memo[0] <= self.TTL_SECONDS:
+            return list(memo[1])
+
+        mtime = self._entry_mtime(path)
+        if mtime is None or current_time - mtime > self.TTL_SECONDS:
+            # Cache expired (or missing), remove entry without decoding it
+            self._memory.pop(path, None)
+            path.unlink(missing_ok=True)
             return None
-        
-        return self._deserialize_results(results_data)
-    
+
+        results_data = self._load_entry(path)
+        if results_data is None:
+            return None
+
+        results = self._deserialize_results(results_data)
+        self._memory[path] = (mtime, results)
+        return list(results)
+
     def set(self, query: str, results: List[Package]) -> None:
         """
         Save results to cache.
-        
+
         Args:
             query: Search query string
             results: List of Package objects to cache
         """
-        cache = self._load_cache()
-        cache[query] = {
-            "timestamp": time.time(),
-            "results": self._serialize_results(results)
-        }
-        self._save_cache(cache)
-    
+        path = self._entry_path(query)
+        self._memory[path] = (time.time(), list(results))
+        self._save_entry(path, self._serialize_results(results))
+
     def clear(self) -> None:
         """Clear all cached entries for this provider."""
-        try:
-            if self.cache_file.exists():
-                self.cache_file.unlink()
-        except IOError:
-            pass
-    
+        if not _inside_cache_dir(self.cache_dir):
+            return
+        for path in [p for p in self._memory if p.parent == self.cache_dir]:
+            del self._memory[path]
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._ensure_cache_dir()
+
     def clear_expired(self) -> None:
         """Remove only expired entries from cache."""
-        cache = self._load_cache()
         current_time = time.time()
-        
-        expired_keys = [
-            key for key, entry in cache.items()
-            if current_time - entry.get("timestamp", 0) > self.TTL_SECONDS
-        ]
-        
-        for key in expired_keys:
-            del cache[key]
-        
-        if expired_keys:
-            self._save_cache(cache)
+
+        for path in self.cache_dir.glob("*.json"):
+            if self._is_expired(path, current_time):
+                self._memory.pop(path, None)
+                path.unlink(missing_ok=True)
+
+
+class InstalledCache:
+    """
+    Snapshot em disco dos pacotes instalados de um provider.
+
+    Um arquivo por provider guarda a assinatura do estado instalado (ex.: o
+    caminho resolvido do profile Nix) junto com a lista de pacotes. O snapshot
+    vale enquanto a assinatura não mudar; não há TTL.
+    """
+
+    def __init__(self, provider_name: str):
+        """
+        Initialize the snapshot for a specific provider.
+
+        Args:
+            provider_name: Name of the provider (e.g., 'nixpkgs', 'flatpak')
+        """
+        self.provider_name = provider_name
+        self.path = SearchCache.CACHE_DIR / "installed" / f"{provider_name}.json"
+
+    def get(self, signature: str) -> Optional[List[Package]]:
+        """
+        Get the snapshot if it was taken under the given signature.
+
+        Args:
+            signature: The provider's current installed signature
+
+        Returns:
+            The installed packages, or None if missing, unreadable or stale
+        """
+        if not _inside_cache_dir(self.path):
+            return None
+        try:
+            data = orjson.loads(self.path.read_bytes())
+        except (orjson.JSONDecodeError, ValueError, OSError):
+            return None
+
+        if not isinstance(data, dict) or data.get("signature") != signature:
+            return None
+        return list(map(Package.from_dict, data.get("packages", [])))
+
+    def set(self, signature: str, packages: List[Package]) -> None:
+        """
+        Save the installed packages under the given signature.
+
+        Args:
+            signature: The provider's current installed signature
+            packages: List of installed Package objects
+        """
+        if not _inside_cache_dir(self.path):
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return
+        payload = {"signature": signature, "packages": list(map(Package.to_dict, packages))}
+        _write_atomic(self.path, orjson.dumps(payload))
+
+    def clear(self) -> None:
+        """Remove the snapshot for this provider."""
+        if _inside_cache_dir(self.path):
+            self.path.unlink(missing_ok=True)
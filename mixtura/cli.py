@@ -5,19 +5,22 @@ A unified package manager CLI that supports Nix, Flatpak, and Homebrew.
 Built with Typer for a modern CLI experience.
 """
 
+import functools
+import re
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
 import typer
 from typing_extensions import Annotated
 
 from mixtura.core.service import PackageService
+from mixtura.core.filtering import filter_results_smart, iter_filter_results_smart
 from mixtura.core.package import PackageSpec, Package
-from mixtura.core.providers import get_all_providers, get_available_providers
+from mixtura.core.providers import get_all_providers, get_available_providers, warm_providers
 from mixtura.ui import console, print_logo, log_warn, log_info, log_task, log_error
 from mixtura.ui.display import display_package_list, display_installed_packages, display_operation_results
 from mixtura.ui.prompts import select_package
-from mixtura.update import check_for_updates
+from mixtura.update import check_for_updates, update_check_due, mark_update_checked
 
 # Create main Typer app with Rich markup support
 app = typer.Typer(
@@ -32,12 +35,22 @@ app = typer.Typer(
 # Create service instance (stateless business logic)
 service = PackageService()
 
+# Names that can only belong to one provider, so add can skip the search fan-out
+_FLATPAK_APP_ID = re.compile(r"^(?:com|org|io|net|dev|app|page)\.[\w-]+(?:\.[\w-]+)+$")
+_BREW_TAP_FORMULA = re.compile(r"^[\w-]+/[\w-]+/[\w@.+-]+$")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_version() -> str:
+    """Read the bundled VERSION file once per process."""
+    version_path = Path(__file__).parent / "VERSION"
+    return version_path.read_text().strip() if version_path.exists() else "unknown"
+
 
 def version_callback(value: bool) -> None:
     """Show version and exit."""
     if value:
-        version_path = Path(__file__).parent / "VERSION"
-        version = version_path.read_text().strip() if version_path.exists() else "unknown"
+        version = _get_version()
         console.print(f"[main]Mixtura[/main] version [bold]{version}[/bold]")
         raise typer.Exit()
 
@@ -59,8 +72,14 @@ def main(
         ctx: Typer context.
         version: Flag to show version and exit.
     """
-    # Check for updates at startup
-    check_for_updates()
+    # Load and probe providers in the background while the update check runs
+    if ctx.invoked_subcommand is not None:
+        warm_providers()
+    
+    # Check for updates at startup (at most once per UPDATE_CHECK_INTERVAL)
+    if update_check_due():
+        check_for_updates()
+        mark_update_checked()
     
     # Print logo when showing help (no subcommand)
     if ctx.invoked_subcommand is None:
@@ -81,6 +100,10 @@ def add(
         bool,
         typer.Option("--all", "-a", help="Show all search results instead of filtering")
     ] = False,
+    auto: Annotated[
+        bool,
+        typer.Option("--auto/--no-auto", help="Install a single exact name match without prompting")
+    ] = True,
 ) -> None:
     """
     [#78dcb4]Install[/#78dcb4] packages from Nix, Flatpak, or Homebrew.
@@ -92,63 +115,65 @@ def add(
         packages: List of packages to install.
         yes: Auto-select if only one high-confidence result found.
         show_all: Show all search results instead of filtering fuzzy matches.
+        auto: Auto-select when exactly one result matches the name exactly.
     """
     print_logo()
     
     params_for_install: List[PackageSpec] = []
-    
-    for arg in packages:
-        # Handle comma-separated input if user does "git,vim"
-        items = [p.strip() for p in arg.split(',') if p.strip()]
-        
-        for item in items:
-            try:
-                # Parse user input
-                spec = PackageSpec.parse(item)
-                
-                # Case 1: Provider is explicit (e.g. "nixpkgs#vim")
-                if spec.provider:
-                    params_for_install.append(spec)
-                    continue
-                
-                # Case 2: Ambiguous (e.g. "vim") - Search and Prompt
-                log_task(f"Searching for '[bold]{spec.name}[/bold]' across all providers...")
-                search_results = service.search(spec.name)
-                
-                if not search_results:
-                    log_warn(f"No packages found for '{spec.name}'.")
+    parsed = [(item, _with_inferred_provider(spec)) for item, spec in _parse_specs(packages)]
+
+    # Ambiguous names (e.g. "vim") are searched up front in one batch, so each
+    # provider is queried once for all of them instead of once per name.
+    ambiguous = list(dict.fromkeys(spec.name for _, spec in parsed if not spec.provider))
+    if ambiguous:
+        names = ", ".join(f"'[bold]{name}[/bold]'" for name in ambiguous)
+        log_task(f"Searching for {names} across all providers...")
+
+    searches = service.search_many(ambiguous) if ambiguous else {}
+
+    for item, spec in parsed:
+        try:
+            # Case 1: Provider is explicit (e.g. "nixpkgs#vim")
+            if spec.provider:
+                params_for_install.append(spec)
+                continue
+            
+            # Case 2: Ambiguous (e.g. "vim") - Prompt on the search results
+            search_results = searches[spec.name]
+            
+            if not search_results:
+                log_warn(f"No packages found for '{spec.name}'.")
+                continue
+
+            # Exact name matches, glob matches for wildcards, or everything with --all
+            filtered = filter_results_smart(search_results, spec.name, show_all)
+            if not filtered:
+                log_warn(f"No packages found for '{spec.name}'.")
+                continue
+
+            # Auto-confirm or prompt. A single exact name match is unambiguous,
+            # so it skips the prompt unless --no-auto was given.
+            exact_match = not show_all and filtered[0].name_lower == spec.name.lower()
+            if len(filtered) == 1 and (yes or (auto and exact_match)):
+                log_info(f"Auto-selecting: {filtered[0].name} ({filtered[0].provider})")
+                selected_pkg = filtered[0]
+            else:
+                display_package_list(filtered, f"Found matches for '{spec.name}'")
+                # select_package returns List[Package] or None
+                user_selection = select_package(filtered, "Select specific package to install")
+                if not user_selection:
                     continue
+                selected_pkg = user_selection[0]
+                # The prompt allows checking multiple. Let's support it.
+                for p in user_selection:
+                     params_for_install.append(PackageSpec(name=p.id or p.name, provider=p.provider))
+                continue # handled via loop
 
-                # Filter results (simple exact match logic or show all)
-                filtered = search_results
-                if not show_all:
-                    exact = [p for p in search_results if p.name.lower() == spec.name.lower()]
-                    if exact:
-                        filtered = exact
-
-                # Auto-confirm or prompt
-                if yes and len(filtered) == 1:
-                    log_info(f"Auto-selecting: {filtered[0].name} ({filtered[0].provider})")
-                    selected_pkg = filtered[0]
-                else:
-                    display_package_list(filtered, f"Found matches for '{spec.name}'")
-                    # select_package returns List[Package] or None
-                    user_selection = select_package(filtered, "Select specific package to install")
-                    if not user_selection:
-                        continue
-                    selected_pkg = user_selection[0]
-                    # The prompt allows checking multiple. Let's support it.
-                    for p in user_selection:
-                         params_for_install.append(PackageSpec(name=p.id or p.name, provider=p.provider))
-                    continue # handled via loop
-
-                # Add single selection
-                params_for_install.append(PackageSpec(name=selected_pkg.id or selected_pkg.name, provider=selected_pkg.provider))
-
-            except ValueError as e:
-                log_error(f"Invalid package format '{item}': {e}")
-            except Exception as e:
-                log_error(f"Error processing '{item}': {e}")
+            # Add single selection
+            params_for_install.append(PackageSpec(name=selected_pkg.id or selected_pkg.name, provider=selected_pkg.provider))
+
+        except Exception as e:
+            log_error(f"Error processing '{item}': {e}")
 
     if not params_for_install:
         log_warn("No packages selected for installation.")
@@ -165,6 +190,68 @@ def add(
     display_operation_results(display_results, "Installation finished.", "Installation completed with errors.")
 
 
+def _with_inferred_provider(spec: PackageSpec) -> PackageSpec:
+    """
+    Attach a provider to specs whose name already identifies one.
+    
+    Flatpak app IDs (e.g. "com.spotify.Client") and Homebrew tap formulae
+    (e.g. "user/tap/formula") go straight to that provider when it's available.
+
+    Args:
+        spec: A parsed package specification.
+
+    Returns:
+        PackageSpec: The spec with a provider set, or the original spec.
+    """
+    if spec.provider:
+        return spec
+    
+    if _FLATPAK_APP_ID.match(spec.name):
+        provider = "flatpak"
+    elif _BREW_TAP_FORMULA.match(spec.name):
+        provider = "homebrew"
+    else:
+        return spec
+    
+    if provider not in get_available_providers():
+        return spec
+    return PackageSpec(name=spec.name, provider=provider)
+
+
+def _parse_specs(args: List[str]) -> List[Tuple[str, PackageSpec]]:
+    """
+    Split comma-separated arguments and parse each token in a single pass.
+    
+    Invalid tokens (e.g. "flatpak#" or "#git") are reported together up front
+    and left out of the result, so callers only iterate valid specs.
+
+    Args:
+        args: Raw arguments, e.g. ["git,vim", "flatpak#Spotify"].
+
+    Returns:
+        List[Tuple[str, PackageSpec]]: (token, spec) pairs in input order.
+    """
+    parsed: List[Tuple[str, PackageSpec]] = []
+    errors: List[str] = []
+    
+    for arg in args:
+        # Handle comma-separated input if user does "git,vim"
+        for item in arg.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            spec = PackageSpec.parse(item)
+            if not spec.name or spec.provider == "":
+                errors.append(item)
+                continue
+            parsed.append((item, spec))
+    
+    for item in errors:
+        log_error(f"Invalid package format '{item}': expected 'package' or 'provider#package'")
+    
+    return parsed
+
+
 @app.command()
 def remove(
     packages: Annotated[
@@ -190,53 +277,51 @@ def remove(
     """
     print_logo()
     params_for_removal: List[PackageSpec] = []
+    # (provider, name) pairs already queued, so repeated picks aren't queued twice
+    queued: Set[Tuple[Optional[str], str]] = set()
+    # Installed packages as (lowercased name, package) pairs, listed once on the
+    # first ambiguous item so each name is lowercased once per command
+    installed: Optional[List[Tuple[str, Package]]] = None
+    # Matches per lowercased name, so repeated names ("git", "GIT") scan once
+    matches_by_needle: Dict[str, List[Package]] = {}
     
-    for arg in packages:
-        items = [p.strip() for p in arg.split(',') if p.strip()]
-        for item in items:
-            try:
-                spec = PackageSpec.parse(item)
-                
-                if spec.provider:
+    for item, spec in _parse_specs(packages):
+        try:
+            if spec.provider:
+                if (spec.provider, spec.name) not in queued:
+                    queued.add((spec.provider, spec.name))
                     params_for_removal.append(spec)
-                    continue
-                
-                # Search installed
-                log_task(f"Searching installed packages for '[bold]{spec.name}[/bold]'...")
-                # We need a way to list installed and filter? Or just search?
-                # Service layer doesn't have "search_installed" explicitly efficiently, 
-                # but list_packages is per provider.
-                # Let's iterate providers via service.
-                
-                matches = []
-                for provider_name in ["nixpkgs", "flatpak", "homebrew"]: # or get_available
-                    mgr = service.get_provider(provider_name)
-                    if mgr and mgr.is_available():
-                        # optimize: list only if needed? list is expensive.
-                        # Maybe we should assume user knows? Or implement search_installed in service?
-                        # For now, let's just create generic specs if 'yes' is explicit?
-                        # No, we must find where it is installed to remove it.
-                        pkgs = mgr.list_packages()
-                        for p in pkgs:
-                            if spec.name.lower() in p.name.lower():
-                                matches.append(p)
-                
-                if not matches:
-                    log_warn(f"No installed package found matching '{spec.name}'")
-                    continue
-                
-                # Prompt
-                selected: Optional[List[Package]] = matches
-                if not yes or len(matches) > 1:
-                    display_package_list(matches, f"Installed matches for '{spec.name}'")
-                    selected = select_package(matches, "Select packages to remove", allow_all=True)
-                
-                if selected:
-                     for p in selected:
-                         params_for_removal.append(PackageSpec(name=p.id or p.name, provider=p.provider))
-
-            except Exception as e:
-                log_error(f"Error processing '{item}': {e}")
+                continue
+            
+            # Search installed
+            log_task(f"Searching installed packages for '[bold]{spec.name}[/bold]'...")
+            if installed is None:
+                installed = [(p.name_lower, p) for pkgs in service.list_installed().values() for p in pkgs]
+            
+            needle = spec.name.lower()
+            matches = matches_by_needle.get(needle)
+            if matches is None:
+                matches = matches_by_needle[needle] = [p for name, p in installed if needle in name]
+            
+            if not matches:
+                log_warn(f"No installed package found matching '{spec.name}'")
+                continue
+            
+            # Prompt
+            selected: Optional[List[Package]] = matches
+            if not yes or len(matches) > 1:
+                display_package_list(matches, f"Installed matches for '{spec.name}'")
+                selected = select_package(matches, "Select packages to remove", allow_all=True)
+            
+            if selected:
+                 for p in selected:
+                     key = (p.provider, p.id or p.name)
+                     if key not in queued:
+                         queued.add(key)
+                         params_for_removal.append(PackageSpec(name=key[1], provider=p.provider))
+
+        except Exception as e:
+            log_error(f"Error processing '{item}': {e}")
 
     if not params_for_removal:
         log_warn("No packages selected for removal.")
@@ -294,29 +379,25 @@ def list_packages(
     """
     print_logo()
     
-    mgrs = []
     if provider:
         mgr = service.get_provider(provider)
-        if mgr:
-            mgrs.append(mgr)
-        else:
+        if not mgr:
             log_warn(f"Unknown provider '{provider}'")
             return
-    else:
-        # Get all available
-        all_provs = get_available_providers()
-        mgrs = list(all_provs.values())
-        
-    if not mgrs:
-        log_warn("No available package managers found.")
-        return
-        
-    for mgr in mgrs:
         if not mgr.is_available():
-            continue
+            return
         log_task(f"Fetching packages from {mgr.name}...")
-        pkgs = mgr.list_packages()
-        display_installed_packages(pkgs, mgr.name)
+        installed = {mgr.name: mgr.list_packages()}
+    else:
+        if not get_available_providers():
+            log_warn("No available package managers found.")
+            return
+        # Providers are listed in parallel; output keeps the registry order
+        log_task("Fetching installed packages...")
+        installed = service.list_installed()
+        
+    for name, pkgs in installed.items():
+        display_installed_packages(pkgs, name)
 
 
 @app.command()
@@ -329,6 +410,10 @@ def search(
         bool,
         typer.Option("--all", "-a", help="Show all results instead of filtering")
     ] = False,
+    no_cache: Annotated[
+        bool,
+        typer.Option("--no-cache", help="Query the providers even if results are cached")
+    ] = False,
 ) -> None:
     """
     [#d2a064]Search[/#d2a064] for packages across all providers.
@@ -336,6 +421,7 @@ def search(
     Args:
         query: Search terms.
         show_all: Show all results instead of filtering.
+        no_cache: Skip cached results; fresh results still refresh the cache.
     """
     print_logo()
     
@@ -345,18 +431,19 @@ def search(
         # Search all or specific
         if spec.provider:
             mgr = service.get_provider(spec.provider)
-            if mgr:
-                 results = mgr.search(spec.name)
-            else:
-                 results = []
+            batches = [mgr.search(spec.name, use_cache=not no_cache)] if mgr else []
         else:
-            results = service.search(spec.name)
-            
-        if not results:
+            # Each provider's results arrive as it finishes
+            batches = service.iter_search(spec.name, use_cache=not no_cache)
+        
+        # Show matches as soon as they are known, continuing the numbering
+        shown = 0
+        for matches in iter_filter_results_smart(batches, spec.name, show_all):
+            display_package_list(matches, f"Matches for '{q}'", start=shown + 1)
+            shown += len(matches)
+        
+        if not shown:
             log_warn(f"No results for '{q}'")
-            continue
-            
-        display_package_list(results, f"Matches for '{q}'")
 
 
 @app.command()
@@ -365,40 +452,62 @@ def clean(
         Optional[List[str]],
         typer.Argument(help="Specific providers to clean. Empty = clean all.")
     ] = None,
+    cache: Annotated[
+        bool,
+        typer.Option("--cache", help="Only clear Mixtura's cached searches and installed-package snapshots")
+    ] = False,
 ) -> None:
     """
     [#d2a064]Clean[/#d2a064] up unused packages.
 
     Args:
         modules: Specific providers to clean. If empty, cleans all.
+        cache: Only clear Mixtura's caches instead of running garbage collection.
     """
     print_logo()
     
+    if cache:
+        # Imported here so other commands don't pay for loading the cache module
+        from mixtura.cache import InstalledCache, SearchCache
+        
+        known = get_all_providers()
+        names: List[str] = []
+        for m in modules or list(known):
+            if m in known:
+                names.append(m)
+            else:
+                log_warn(f"Unknown provider '{m}'.")
+        
+        if not names:
+            return
+        
+        for name in names:
+            SearchCache(name).clear()
+            InstalledCache(name).clear()
+        log_info("Cache cleared.")
+        return
+    
     available = get_available_providers()
-    target_provers = []
+    targets: List[str] = []
     
     if modules:
         for m in modules:
             if m in available:
-                target_provers.append(available[m])
+                targets.append(m)
             else:
                 log_warn(f"Provider '{m}' not available.")
     else:
-        target_provers = list(available.values())
+        targets = list(available)
         
-    if not target_provers:
+    if not targets:
         return
 
-    results = []
-    for mgr in target_provers:
-        log_task(f"Cleaning {mgr.name}...")
-        try:
-            mgr.clean()
-            results.append((mgr.name, True, "Cleaned"))
-        except Exception as e:
-            results.append((mgr.name, False, str(e)))
-            
-    display_operation_results(results, "Clean finished.")
+    # Providers clean up independently, so they run side by side
+    log_task(f"Cleaning {', '.join(targets)}...")
+    results = service.clean(targets)
+    
+    display_results = [(r.provider, r.success, r.message) for r in results]
+    display_operation_results(display_results, "Clean finished.")
 
 
 @app.command()
@@ -410,16 +519,16 @@ def info() -> None:
     all_providers = get_all_providers()
     available = get_available_providers()
     
-    console.print("[main bold]Available Package Managers:[/main bold]")
-    console.print()
-    
-    for name, provider in all_providers.items():
+    lines = ["[main bold]Available Package Managers:[/main bold]", ""]
+    for name in all_providers:
         if name in available:
-            console.print(f"  [success]●[/success] [bold]{name}[/bold] [dim](available)[/dim]")
+            lines.append(f"  [success]●[/success] [bold]{name}[/bold] [dim](available)[/dim]")
         else:
-            console.print(f"  [dim]○ {name} (not installed)[/dim]")
+            lines.append(f"  [dim]○ {name} (not installed)[/dim]")
+    lines.append("")
     
-    console.print()
+    # One write for the whole listing instead of one per provider
+    console.print("\n".join(lines))
 
 if __name__ == "__main__":
     app()
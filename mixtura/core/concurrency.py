@@ -8,7 +8,7 @@ a provider to request exclusive access (exclusive mode), effectively pausing oth
 
 import threading
 from contextlib import contextmanager
-from typing import Generator, Dict
+from typing import Generator
 
 
 class ProviderLock:
@@ -33,40 +33,54 @@ class ProviderLock:
         self._active_writers = 0
         self._waiting_writers = 0
         
-        # Track which threads are reading and how many times (reentrancy)
-        self._reader_threads: Dict[int, int] = {}
+        # How many times the current thread holds the shared lock (reentrancy).
+        # Only the owning thread touches its count, so reentrant acquires and
+        # releases don't need the mutex; it's taken on 0 <-> 1 transitions only.
+        self._local = threading.local()
+
+    def _shared_count(self) -> int:
+        """Return how many times the current thread holds the shared lock."""
+        return getattr(self._local, "count", 0)
 
     def acquire_shared(self) -> None:
         """
         Acquire the lock in shared mode.
         """
-        tid = threading.get_ident()
-        with self._lock:
-            # If we are already a reader, just increment
-            if tid in self._reader_threads:
-                self._reader_threads[tid] += 1
-                return
+        count = self._shared_count()
+        # If we are already a reader, just increment
+        if count:
+            self._local.count = count + 1
+            return
+        
+        self._enter_shared()
+        self._local.count = 1
+
+    def release_shared(self) -> None:
+        """Release the lock from shared mode."""
+        count = self._shared_count()
+        if not count:
+            raise RuntimeError("Thread does not hold shared lock")
+        
+        self._local.count = count - 1
+        if count == 1:
+            self._leave_shared()
 
+    def _enter_shared(self) -> None:
+        """Register the current thread as an active reader (0 -> 1 transition)."""
+        with self._lock:
             # Wait while there is an active writer or waiting writers
             while self._active_writers > 0 or self._waiting_writers > 0:
                 self._readers_ok.wait()
             
             self._active_readers += 1
-            self._reader_threads[tid] = 1
 
-    def release_shared(self) -> None:
-        """Release the lock from shared mode."""
-        tid = threading.get_ident()
+    def _leave_shared(self) -> None:
+        """Unregister the current thread as an active reader (1 -> 0 transition)."""
         with self._lock:
-            if tid not in self._reader_threads:
-                raise RuntimeError("Thread does not hold shared lock")
-                
-            self._reader_threads[tid] -= 1
-            if self._reader_threads[tid] == 0:
-                del self._reader_threads[tid]
-                self._active_readers -= 1
-                if self._active_readers == 0:
-                    self._writers_ok.notify_all()
+            self._active_readers -= 1
+            if self._active_readers == 0:
+                # Only one writer can get in, so wake just one
+                self._writers_ok.notify()
 
     def acquire_exclusive(self) -> None:
         """
@@ -84,13 +98,20 @@ class ProviderLock:
                 self._active_writers += 1
             finally:
                 self._waiting_writers -= 1
+                # Readers queued behind us must not stall if we gave up waiting
+                if self._waiting_writers == 0 and self._active_writers == 0:
+                    self._readers_ok.notify_all()
 
     def release_exclusive(self) -> None:
         """Release the lock from exclusive mode."""
         with self._lock:
             self._active_writers -= 1
-            self._writers_ok.notify_all()
-            self._readers_ok.notify_all()
+            # Hand off to the next writer if one is queued (readers would only
+            # re-sleep behind it); otherwise let all waiting readers in.
+            if self._waiting_writers > 0:
+                self._writers_ok.notify()
+            else:
+                self._readers_ok.notify_all()
 
     @contextmanager
     def shared(self) -> Generator[None, None, None]:
@@ -109,21 +130,14 @@ class ProviderLock:
         If the current thread holds a shared lock, it temporarily releases it,
         acquires exclusive lock, and re-acquires shared lock on exit.
         """
-        tid = threading.get_ident()
-        is_reader = False
-        reader_count = 0
-        
         # Check if we need escalation
-        with self._lock:
-            if tid in self._reader_threads:
-                is_reader = True
-                reader_count = self._reader_threads[tid]
+        reader_count = self._shared_count()
         
-        if is_reader:
+        if reader_count:
             # Escalation path
-            # 1. Release shared lock completely
-            for _ in range(reader_count):
-                self.release_shared()
+            # 1. Release shared lock completely, whatever its depth, in one step
+            self._local.count = 0
+            self._leave_shared()
                 
             try:
                 # 2. Acquire exclusive
@@ -133,9 +147,9 @@ class ProviderLock:
                 finally:
                     self.release_exclusive()
             finally:
-                # 3. Restore shared lock
-                for _ in range(reader_count):
-                    self.acquire_shared()
+                # 3. Restore shared lock at its previous depth
+                self._enter_shared()
+                self._local.count = reader_count
         else:
             # Normal exclusive path
             self.acquire_exclusive()
@@ -0,0 +1,123 @@
+"""
+Result filtering for Mixtura.
+
+Narrows provider search results down to what the user most likely meant:
+exact name matches for plain queries, glob matches for wildcard queries.
+"""
+
+import fnmatch
+import functools
+import re
+from typing import Iterable, Iterator, List, Pattern, Tuple
+
+from mixtura.core.package import Package
+
+WILDCARD_CHARS = frozenset("*?[")
+
+# Splits a glob into its literal runs ("*-nvim" -> "", "-nvim"). Classes follow
+# fnmatch: an optional "!", then a "]" right after it is a member, not the end.
+_GLOB_TOKEN = re.compile(r"[*?]|\[!?\]?[^\]]*\]")
+
+
+def _longest_literal(pattern: str) -> str:
+    """
+    Return the longest literal run of a glob pattern.
+
+    Every name matching the glob contains this run, so it makes a sound
+    prefilter before the regex.
+
+    Args:
+        pattern: A glob pattern, e.g. "neovim-*".
+
+    Returns:
+        str: The longest literal substring, or "" if the pattern has none.
+    """
+    return max(_GLOB_TOKEN.split(pattern), key=len)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_glob(pattern: str) -> Tuple[Pattern[str], str]:
+    """
+    Compile a lowercased glob once per process.
+
+    The same pattern is filtered repeatedly (several queries in one command,
+    search then add), so its regex and prefilter literal are kept.
+
+    Args:
+        pattern: A lowercased glob pattern.
+
+    Returns:
+        Tuple[Pattern[str], str]: The compiled regex and its longest literal run.
+    """
+    return re.compile(fnmatch.translate(pattern)), _longest_literal(pattern)
+
+
+def filter_results_smart(results: List[Package], query: str, show_all: bool = False) -> List[Package]:
+    """
+    Filter search results the way the user most likely meant them.
+
+    - show_all: every result, unfiltered.
+    - Wildcard query ("vim-*", "*-nvim"): names matching the glob, case-insensitive.
+    - Plain query: exact name matches if there are any, otherwise every result.
+
+    Args:
+        results: Packages returned by the providers.
+        query: The user's query.
+        show_all: Skip filtering entirely.
+
+    Returns:
+        List[Package]: The filtered packages, in their original order.
+    """
+    if show_all or not results:
+        return results
+
+    needle = query.lower()
+    if WILDCARD_CHARS.isdisjoint(needle):
+        exact = [p for p in results if p.name_lower == needle]
+        return exact if exact else results
+
+    regex, anchor = _compile_glob(needle)
+    # A C-level substring test rejects most names far cheaper than the regex
+    return [p for p in results if anchor in p.name_lower and regex.match(p.name_lower)]
+
+
+def iter_filter_results_smart(
+    batches: Iterable[List[Package]], query: str, show_all: bool = False
+) -> Iterator[List[Package]]:
+    """
+    Apply filter_results_smart to results that arrive in batches.
+
+    Matches are yielded as soon as they are known to be in the final result:
+    every batch's glob matches (or the whole batch with show_all), and exact
+    name matches for plain queries. Non-exact results of a plain query are
+    held back and yielded at the end only if no exact match turned up, so the
+    yielded lists add up to filter_results_smart over all batches.
+
+    Args:
+        batches: Packages per provider, in the order the providers answered.
+        query: The user's query.
+        show_all: Skip filtering entirely.
+
+    Yields:
+        List[Package]: Non-empty groups of matching packages.
+    """
+    needle = query.lower()
+    if show_all or not WILDCARD_CHARS.isdisjoint(needle):
+        for batch in batches:
+            matches = filter_results_smart(batch, query, show_all)
+            if matches:
+                yield matches
+        return
+
+    held: List[Package] = []
+    found_exact = False
+    for batch in batches:
+        exact = [p for p in batch if p.name_lower == needle]
+        if exact:
+            found_exact = True
+            yield exact
+        elif not found_exact:
+            held.extend(batch)
+
+    if not found_exact and held:
+        yield held
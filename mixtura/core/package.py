@@ -6,8 +6,12 @@ replacing loose Dict[str, Any] usage throughout the codebase.
 """
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Optional, Dict, Any
 
+# Keys of Package.to_dict() that map to fields; anything else lives in `extra`
+_FIELD_KEYS = frozenset(("name", "provider", "id", "version", "description", "installed", "origin"))
+
 
 @dataclass
 class Package:
@@ -36,6 +40,11 @@ class Package:
     origin: Optional[str] = None  # Useful for Nix (attrPath)
     extra: Dict[str, Any] = field(default_factory=dict)  # Provider-specific data
     
+    @cached_property
+    def name_lower(self) -> str:
+        """Lowercased name, computed once per package for case-insensitive matching."""
+        return self.name.lower()
+    
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert to dictionary for backwards compatibility.
@@ -80,8 +89,9 @@ class Package:
             description=data.get("description", ""),
             installed=data.get("installed", False),
             origin=data.get("origin"),
-            extra={k: v for k, v in data.items() 
-                   if k not in ("name", "provider", "id", "version", "description", "installed", "origin")},
+            # A C-level subset test spares the per-key scan for the common no-extras case
+            extra={} if _FIELD_KEYS.issuperset(data) else
+                  {k: v for k, v in data.items() if k not in _FIELD_KEYS},
         )
     
     def __str__(self) -> str:
@@ -123,27 +133,13 @@ class PackageSpec:
         """
         if not spec_str:
             raise ValueError("Package specification cannot be empty")
-            
-        if "#" in spec_str:
-            parts = spec_str.split("#", 1)
-            if not parts[0] or not parts[1]:
-                 # Handle cases like "#package" or "provider#" which are invalid
-                 # For now, let's keep it simple: if part[0] is empty -> provider is empty string (technically allowed by split but logically wrong?)
-                 # Actually, let's just use what split gives us.
-                 pass
-            
-            p_name = parts[0].strip()
-            pkg_name = parts[1].strip()
-            
-            if not p_name or not pkg_name:
-                 # If "flatpak#" -> provider="flatpak", name="" -> invalid?
-                 # If "#git" -> provider="", name="git" -> valid-ish?
-                 # Let's enforce that both must be present if # is used.
-                 pass
-
-            return cls(name=pkg_name, provider=p_name)
-            
-        return cls(name=spec_str)
+        
+        # Single scan for the separator; bare names (the common case) come back as-is
+        p_name, sep, pkg_name = spec_str.partition("#")
+        if not sep:
+            return cls(name=spec_str)
+        
+        return cls(name=pkg_name.strip(), provider=p_name.strip())
         
     def __str__(self) -> str:
         if self.provider:
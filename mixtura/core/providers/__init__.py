@@ -4,6 +4,7 @@ Package providers for Mixtura.
 Explicit loading of all available package manager providers.
 """
 
+import threading
 from typing import Dict, TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
@@ -12,6 +13,11 @@ if TYPE_CHECKING:
 # Lazy loading to avoid import errors if a provider has issues
 _providers_cache: Dict[str, "PackageManager"] = {}
 _loaded = False
+# Guards loading and probing, which may also run on the warm-up thread
+_lock = threading.RLock()
+
+# Availability probes (PATH lookups) are done once per process
+_available_cache: Optional[Dict[str, "PackageManager"]] = None
 
 
 def _load_providers() -> None:
@@ -21,6 +27,14 @@ def _load_providers() -> None:
     if _loaded:
         return
     
+    with _lock:
+        if not _loaded:
+            _import_providers()
+            _loaded = True
+
+
+def _import_providers() -> None:
+    """Import and instantiate each provider, skipping any that fail to import."""
     # Import providers explicitly - no magic discovery
     try:
         from mixtura.core.providers.nixpkgs.provider import NixProvider
@@ -39,8 +53,6 @@ def _load_providers() -> None:
         _providers_cache["homebrew"] = HomebrewProvider()
     except ImportError:
         pass
-    
-    _loaded = True
 
 
 def get_all_providers() -> Dict[str, "PackageManager"]:
@@ -72,11 +84,50 @@ def get_available_providers() -> Dict[str, "PackageManager"]:
     """
     Get all providers that are currently available (installed on system).
     
+    Availability is probed on the first call and reused for the rest of the
+    process, so a command checks each provider binary only once.
+    
     Returns:
         Dict[str, PackageManager]: Dictionary of available providers.
     """
-    _load_providers()
-    return {name: prov for name, prov in _providers_cache.items() if prov.is_available()}
+    global _available_cache
+    
+    with _lock:
+        if _available_cache is None:
+            _load_providers()
+            _available_cache = {name: prov for name, prov in _providers_cache.items() if prov.is_available()}
+        return _available_cache.copy()
+
+
+def warm_providers() -> threading.Thread:
+    """
+    Load providers and probe their availability on a background thread.
+    
+    Lets the provider imports overlap other startup work (e.g. the update
+    check). Callers need not wait on the thread: the registry functions take
+    the same lock, so they block only until warming finishes.
+    
+    Returns:
+        threading.Thread: The started daemon thread.
+    """
+    thread = threading.Thread(target=get_available_providers, name="mixtura-warm", daemon=True)
+    thread.start()
+    return thread
+
+
+def invalidate_availability_cache() -> None:
+    """
+    Forget which providers are available so the next lookup probes again.
+    
+    Call this after operations that may have installed or removed a
+    provider's binary (e.g. installing flatpak through nix).
+    """
+    global _available_cache
+    
+    with _lock:
+        _available_cache = None
+        for prov in _providers_cache.values():
+            prov.refresh_availability()
 
 
 def get_default_provider_name() -> str:
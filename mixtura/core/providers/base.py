@@ -7,7 +7,7 @@ This is the Model layer - no UI/print logic should be here.
 
 from abc import ABC, abstractmethod
 from functools import wraps
-from typing import List, Optional, Any, TYPE_CHECKING, TypeVar, Callable, ParamSpec, cast, Generator
+from typing import Dict, List, Optional, Any, TYPE_CHECKING, TypeVar, Callable, ParamSpec, cast, Generator
 from contextlib import contextmanager
 
 from mixtura.core.concurrency import global_provider_lock
@@ -44,6 +44,63 @@ def require_availability(func: Callable[P, R]) -> Callable[P, R]:
     return wrapper
 
 
+def cached_availability(func: Callable[[Any], bool]) -> Callable[[Any], bool]:
+    """
+    Decorator that memoizes `is_available` on the provider instance.
+    
+    Availability probes (PATH lookups) are stable for the lifetime of the
+    process, while `is_available` is checked on nearly every operation.
+    Call `refresh_availability()` to probe again.
+    
+    Args:
+        func: The `is_available` implementation to wrap.
+
+    Returns:
+        Callable: The wrapped function.
+    """
+    @wraps(func)
+    def wrapper(self: Any) -> bool:
+        available = self.__dict__.get("_availability")
+        if available is None:
+            available = self._availability = func(self)
+        return cast(bool, available)
+    return wrapper
+
+
+def cached_installed(func: Callable[[Any], List["Package"]]) -> Callable[[Any], List["Package"]]:
+    """
+    Decorator that keeps an on-disk snapshot of `list_packages`.
+    
+    The snapshot is keyed by `installed_signature()`, which changes whenever
+    the provider's installed set does, so repeated `list`/`remove` runs skip
+    the provider subprocess. Providers without a signature are always listed
+    live. Empty listings are not stored, since providers report failures as
+    an empty list.
+    
+    Args:
+        func: The `list_packages` implementation to wrap.
+
+    Returns:
+        Callable: The wrapped function.
+    """
+    @wraps(func)
+    def wrapper(self: Any) -> List["Package"]:
+        signature = self.installed_signature()
+        if signature is None:
+            return func(self)
+        
+        from mixtura.cache import InstalledCache
+        
+        cache = InstalledCache(self.name)
+        packages = cache.get(signature)
+        if packages is None:
+            packages = func(self)
+            if packages:
+                cache.set(signature, packages)
+        return packages
+    return wrapper
+
+
 class PackageManager(ABC):
     """
     Abstract base class for all package manager modules.
@@ -65,11 +122,18 @@ class PackageManager(ABC):
         """Check if the package manager is installed and usable on the system."""
         pass
 
+    def refresh_availability(self) -> None:
+        """Forget the memoized `is_available` result so the next call probes again."""
+        self.__dict__.pop("_availability", None)
+
     @abstractmethod
     def install(self, packages: List[str]) -> None:
         """
         Install the specified packages.
         
+        Implementations should pass the whole list to a single package-manager
+        invocation; the service calls this once per provider per command.
+        
         Args:
             packages: List of package names or specs to install.
 
@@ -83,6 +147,8 @@ class PackageManager(ABC):
         """
         Uninstall the specified packages.
         
+        Like `install`, the whole list should go to a single invocation.
+        
         Args:
             packages: List of package names or specs to uninstall.
 
@@ -96,6 +162,8 @@ class PackageManager(ABC):
         """
         Upgrade specified packages, or all if packages is None or empty.
         
+        Like `install`, the whole list should go to a single invocation.
+        
         Args:
             packages: Optional list of packages to upgrade. If None, upgrade all.
 
@@ -114,19 +182,103 @@ class PackageManager(ABC):
         """
         pass
 
+    def installed_signature(self) -> Optional[str]:
+        """
+        Return a cheap fingerprint of the installed package set.
+
+        It must change whenever packages are installed, removed or upgraded
+        (e.g. the mtime of the manager's database). Used by `cached_installed`;
+        the default of None opts out of the snapshot.
+
+        Returns:
+            Optional[str]: The signature, or None if it can't be computed cheaply.
+        """
+        return None
+
+    def installed_snapshot(self) -> Optional[List["Package"]]:
+        """
+        Return the installed packages from a still-valid snapshot, if any.
+
+        Never lists live: used where a listing would cost more than it saves,
+        such as skipping already-installed packages before an install.
+
+        Returns:
+            Optional[List[Package]]: The snapshot, or None if there is no valid one.
+        """
+        signature = self.installed_signature()
+        if signature is None:
+            return None
+        
+        from mixtura.cache import InstalledCache
+        
+        return InstalledCache(self.name).get(signature)
+
+    def install_key(self, package: str) -> str:
+        """
+        Return the key an `install()` argument is compared under.
+
+        Must agree with `installed_key` for the same package.
+
+        Args:
+            package: A package name or ID as passed to `install()`.
+
+        Returns:
+            str: The comparison key.
+        """
+        return package
+
+    def installed_key(self, package: "Package") -> str:
+        """
+        Return the key an installed package is compared under.
+
+        Args:
+            package: A package from `list_packages()`.
+
+        Returns:
+            str: The comparison key.
+        """
+        return package.id
+
     @abstractmethod
-    def search(self, query: str) -> List["Package"]:
+    def search(self, query: str, use_cache: bool = True) -> List["Package"]:
         """
         Search for packages matching the query and return results.
 
         Args:
             query: The search string.
+            use_cache: Serve a cached result if there is one. Fresh results
+                are cached either way.
 
         Returns:
             List[Package]: A list of matching packages.
         """
         pass
 
+    def search_many(self, queries: List[str]) -> Dict[str, List["Package"]]:
+        """
+        Search for several queries at once.
+        
+        Providers whose CLI can answer many queries in one invocation should
+        override this; the default runs `search` for each query in parallel,
+        with at most MIXTURA_MAX_WORKERS queries in flight.
+
+        Args:
+            queries: The search strings.
+
+        Returns:
+            Dict[str, List[Package]]: Matching packages per query.
+        """
+        unique = list(dict.fromkeys(queries))
+        if len(unique) <= 1:
+            return {q: self.search(q) for q in unique}
+
+        from concurrent.futures import ThreadPoolExecutor
+        from mixtura.core.service import MAX_WORKERS
+
+        # Own pool (the shared one may be running this very call), same bound
+        with ThreadPoolExecutor(max_workers=min(len(unique), MAX_WORKERS)) as executor:
+            return dict(zip(unique, executor.map(self.search, unique)))
+
     @abstractmethod
     def clean(self) -> None:
         """
@@ -4,13 +4,15 @@ Flatpak package provider for Mixtura.
 Provides integration with Flatpak package manager.
 """
 
+import os
 import shutil
+from pathlib import Path
 from typing import List, Optional
 
-from mixtura.core.providers.base import PackageManager, require_availability
+from mixtura.core.providers.base import PackageManager, cached_availability, cached_installed, require_availability
 from mixtura.core.package import Package
 from mixtura.cache import SearchCache
-from mixtura.utils import run, run_capture
+from mixtura.utils import query_timeout, run, run_capture
 
 
 class FlatpakProvider(PackageManager):
@@ -18,6 +20,7 @@ class FlatpakProvider(PackageManager):
     def name(self) -> str:
         return "flatpak"
 
+    @cached_availability
     def is_available(self) -> bool:
         return shutil.which("flatpak") is not None
 
@@ -48,8 +51,7 @@ class FlatpakProvider(PackageManager):
         Raises:
             CommandError: If uninstall fails.
         """
-        for pkg in packages:
-            run(["flatpak", "uninstall", pkg])
+        run(["flatpak", "uninstall"] + packages)
 
     @require_availability
     def upgrade(self, packages: Optional[List[str]] = None) -> None:
@@ -67,6 +69,34 @@ class FlatpakProvider(PackageManager):
         else:
             run(["flatpak", "update", "-y"] + packages)
 
+    def installed_signature(self) -> Optional[str]:
+        """
+        Return the modification times of the installations' `.changed` markers.
+
+        Flatpak touches `<installation>/.changed` on every deploy, removal and
+        update. Extra installations configured under installations.d are not
+        tracked, so their presence opts out of the snapshot.
+
+        Returns:
+            Optional[str]: The combined marker mtimes, or None if none exist.
+        """
+        if any(Path("/etc/flatpak/installations.d").glob("*.conf")):
+            return None
+
+        data_home = os.environ.get("XDG_DATA_HOME") or str(Path.home() / ".local" / "share")
+        installations = (
+            os.environ.get("FLATPAK_SYSTEM_DIR") or "/var/lib/flatpak",
+            os.environ.get("FLATPAK_USER_DIR") or os.path.join(data_home, "flatpak"),
+        )
+        stamps = []
+        for installation in installations:
+            try:
+                stamps.append(f"{installation}:{os.stat(os.path.join(installation, '.changed')).st_mtime_ns}")
+            except OSError:
+                continue
+        return ";".join(stamps) or None
+
+    @cached_installed
     def list_packages(self) -> List[Package]:
         """
         Return list of installed Flatpak apps.
@@ -79,7 +109,8 @@ class FlatpakProvider(PackageManager):
             
         try:
             returncode, stdout, stderr = run_capture(
-                ["flatpak", "list", "--app", "--columns=name,application,description,version"]
+                ["flatpak", "list", "--app", "--columns=name,application,description,version"],
+                timeout=query_timeout()
             )
             
             packages: List[Package] = []
@@ -99,12 +130,14 @@ class FlatpakProvider(PackageManager):
         except Exception:
             return []
 
-    def search(self, query: str) -> List[Package]:
+    def search(self, query: str, use_cache: bool = True) -> List[Package]:
         """
         Search for packages in Flathub.
 
         Args:
             query: The search query.
+            use_cache: Serve a cached result if there is one. Fresh results
+                are cached either way.
 
         Returns:
             List[Package]: Found packages.
@@ -114,13 +147,14 @@ class FlatpakProvider(PackageManager):
         
         # Check cache first
         cache = SearchCache(self.name)
-        cached = cache.get(query)
+        cached = cache.get(query) if use_cache else None
         if cached is not None:
             return cached
         
         try:
             returncode, stdout, stderr = run_capture(
-                ["flatpak", "search", query, "--columns=name,application,description,version"]
+                ["flatpak", "search", query, "--columns=name,application,description,version"],
+                timeout=query_timeout()
             )
             
             if returncode != 0:
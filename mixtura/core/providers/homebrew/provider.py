@@ -7,10 +7,10 @@ Provides integration with Homebrew package manager (macOS/Linux).
 import shutil
 from typing import List, Optional
 
-from mixtura.core.providers.base import PackageManager, require_availability
+from mixtura.core.providers.base import PackageManager, cached_availability, require_availability
 from mixtura.core.package import Package
 from mixtura.cache import SearchCache
-from mixtura.utils import run, run_capture
+from mixtura.utils import query_timeout, run, run_capture
 
 
 class HomebrewProvider(PackageManager):
@@ -18,6 +18,7 @@ class HomebrewProvider(PackageManager):
     def name(self) -> str:
         return "homebrew"
 
+    @cached_availability
     def is_available(self) -> bool:
         return shutil.which("brew") is not None
 
@@ -76,7 +77,8 @@ class HomebrewProvider(PackageManager):
         try:
             # Get packages installed on request
             rc1, req_stdout, _ = run_capture(
-                ["brew", "list", "--installed-on-request"]
+                ["brew", "list", "--installed-on-request"],
+                timeout=query_timeout()
             )
             if rc1 != 0:
                 return []
@@ -86,7 +88,8 @@ class HomebrewProvider(PackageManager):
             
             # Get versions
             rc2, ver_stdout, _ = run_capture(
-                ["brew", "list", "--versions"]
+                ["brew", "list", "--versions"],
+                timeout=query_timeout()
             )
             
             if rc2 != 0:
@@ -114,12 +117,14 @@ class HomebrewProvider(PackageManager):
         except Exception:
             return []
 
-    def search(self, query: str) -> List[Package]:
+    def search(self, query: str, use_cache: bool = True) -> List[Package]:
         """
         Search for packages in Homebrew.
 
         Args:
             query: Search query.
+            use_cache: Serve a cached result if there is one. Fresh results
+                are cached either way.
 
         Returns:
             List[Package]: Found packages.
@@ -129,13 +134,14 @@ class HomebrewProvider(PackageManager):
         
         # Check cache first
         cache = SearchCache(self.name)
-        cached = cache.get(query)
+        cached = cache.get(query) if use_cache else None
         if cached is not None:
             return cached
         
         try:
             returncode, stdout, stderr = run_capture(
-                ["brew", "search", "--desc", query]
+                ["brew", "search", "--desc", query],
+                timeout=query_timeout()
             )
              
             packages: List[Package] = []
@@ -4,18 +4,50 @@ Nixpkgs package provider for Mixtura.
 Provides integration with Nix package manager.
 """
 
+import os
 import shutil
-import json
+import re
 import sys
+from pathlib import Path
 
 from typing import List, Optional, Dict, Any
 
-from mixtura.core.providers.base import PackageManager, require_availability
+import orjson
+
+from mixtura.core.providers.base import PackageManager, cached_availability, cached_installed, require_availability
 from mixtura.core.package import Package
 from mixtura.cache import SearchCache
 from mixtura.ui import log_warn
 from mixtura.ui.prompts import confirm_action
-from mixtura.utils import run, run_capture, CommandError
+from mixtura.utils import query_timeout, run, run_capture, CommandError
+
+
+# Per-system prefix of flake outputs, e.g. "legacyPackages.x86_64-linux."
+_SYSTEM_PREFIX = re.compile(r"^(?:legacyPackages|packages)\.[^.]+\.")
+
+
+def _installable_key(flake_ref: str, attr_path: str) -> str:
+    """
+    Normalize a flake reference and attribute path to one comparable key.
+
+    "nixpkgs#hello", "flake:nixpkgs" + "legacyPackages.x86_64-linux.hello"
+    and "nixpkgs#legacyPackages.x86_64-linux.hello" all map to "nixpkgs#hello".
+
+    Args:
+        flake_ref: The flake reference, e.g. "nixpkgs" or "flake:nixpkgs".
+        attr_path: The attribute path inside the flake.
+
+    Returns:
+        str: The normalized key.
+    """
+    if flake_ref.startswith("flake:"):
+        flake_ref = flake_ref[len("flake:"):]
+    return f"{flake_ref}#{_SYSTEM_PREFIX.sub('', attr_path)}"
+
+
+def _element_source(element: Dict[str, Any]) -> Dict[str, str]:
+    """Keep the attribute path and flake a profile element was installed from."""
+    return {key: element[key] for key in ("attrPath", "originalUrl") if element.get(key)}
 
 
 class NixProvider(PackageManager):
@@ -23,6 +55,7 @@ class NixProvider(PackageManager):
     def name(self) -> str:
         return "nixpkgs"
 
+    @cached_availability
     def is_available(self) -> bool:
         return shutil.which("nix") is not None
         
@@ -37,9 +70,10 @@ class NixProvider(PackageManager):
         Raises:
             CommandError: If installation fails.
         """
-        for pkg in packages:
-            target = pkg if "#" in pkg else f"nixpkgs#{pkg}"
-            run(["nix", "profile", "add", "--impure", target])
+        # One `nix profile add` for all installables: a single evaluation and
+        # a single new profile generation instead of one per package
+        targets = [pkg if "#" in pkg else f"nixpkgs#{pkg}" for pkg in packages]
+        run(["nix", "profile", "add", "--impure"] + targets)
 
     @require_availability
     def uninstall(self, packages: List[str]) -> None:
@@ -52,8 +86,7 @@ class NixProvider(PackageManager):
         Raises:
             CommandError: If uninstall fails.
         """
-        for pkg in packages:
-            run(["nix", "profile", "remove", pkg], check_warnings=True)
+        run(["nix", "profile", "remove"] + packages, check_warnings=True)
 
     @require_availability
     def upgrade(self, packages: Optional[List[str]] = None) -> None:
@@ -70,12 +103,11 @@ class NixProvider(PackageManager):
             # Upgrade all
             self._upgrade_with_lock_retry(["nix", "profile", "upgrade", "--impure", "--all"])
         else:
-            # Upgrade specific
-            for pkg in packages:
-                self._upgrade_with_lock_retry(
-                    ["nix", "profile", "upgrade", "--impure", pkg],
-                    check_warnings=True
-                )
+            # Upgrade specific, all in one invocation
+            self._upgrade_with_lock_retry(
+                ["nix", "profile", "upgrade", "--impure"] + packages,
+                check_warnings=True
+            )
 
     def _upgrade_with_lock_retry(
         self,
@@ -140,6 +172,38 @@ class NixProvider(PackageManager):
                 cmd=" ".join(cmd)
             )
 
+    def installed_signature(self) -> Optional[str]:
+        """
+        Return the store path the default profile currently points to.
+
+        Every install, removal or upgrade creates a new profile generation,
+        i.e. a new content-addressed store path.
+
+        Returns:
+            Optional[str]: The resolved profile path, or None if there is no profile.
+        """
+        state_home = os.environ.get("XDG_STATE_HOME") or str(Path.home() / ".local" / "state")
+        for profile in (Path.home() / ".nix-profile", Path(state_home) / "nix" / "profile"):
+            if profile.exists():
+                return os.path.realpath(profile)
+        return None
+
+    def install_key(self, package: str) -> str:
+        """Key an installable under its flake and attribute path (see _installable_key)."""
+        flake_ref, sep, attr_path = package.rpartition("#")
+        if not sep:
+            flake_ref = "nixpkgs"
+        return _installable_key(flake_ref, attr_path)
+
+    def installed_key(self, package: Package) -> str:
+        """Key a profile element under the flake and attribute path it came from."""
+        attr_path = package.extra.get("attrPath")
+        original_url = package.extra.get("originalUrl")
+        if not attr_path or not original_url:
+            return package.id
+        return _installable_key(original_url.partition("#")[0], attr_path)
+
+    @cached_installed
     def list_packages(self) -> List[Package]:
         """Return list of installed Nix packages."""
         if not self.is_available():
@@ -147,12 +211,13 @@ class NixProvider(PackageManager):
             
         try:
             returncode, stdout, stderr = run_capture(
-                ["nix", "profile", "list", "--json"]
+                ["nix", "profile", "list", "--json"],
+                timeout=query_timeout()
             )
             if returncode != 0:
                 return []
             
-            data = json.loads(stdout)
+            data = orjson.loads(stdout)
             packages = []
             elements = data.get("elements", {})
             
@@ -219,7 +284,8 @@ class NixProvider(PackageManager):
                 """
                 try:
                     returncode, stdout, stderr = run_capture(
-                        ["nix-store", "--query", "--references", store_path]
+                        ["nix-store", "--query", "--references", store_path],
+                        timeout=query_timeout()
                     )
                     if returncode != 0:
                         return "unknown"
@@ -295,7 +361,7 @@ class NixProvider(PackageManager):
                 # Extract package name from element details to use in reference search
                 package_name = element_details.get("attrPath", "").split('.')[-1]
                 if not package_name:
-                    package_name = element_details.get("originalUrl", "").split('#')[-1]
+                    package_name = element_details.get("originalUrl", "").rpartition('#')[2]
                 
                 if package_name:
                     return _get_version_from_references(store_paths[0], package_name)
@@ -314,7 +380,8 @@ class NixProvider(PackageManager):
                         id=name,
                         version=version,
                         origin=origin,
-                        installed=True
+                        installed=True,
+                        extra=_element_source(details),
                     ))
 
             # Fallback for potential list structure (older versions?)
@@ -330,19 +397,22 @@ class NixProvider(PackageManager):
                         id=name,
                         version=version,
                         origin=attr_path,
-                        installed=True
+                        installed=True,
+                        extra=_element_source(element),
                     ))
                     
             return packages
         except Exception:
             return []
 
-    def search(self, query: str) -> List[Package]:
+    def search(self, query: str, use_cache: bool = True) -> List[Package]:
         """
         Search for packages in Nixpkgs.
 
         Args:
             query: The search query.
+            use_cache: Serve a cached result if there is one. Fresh results
+                are cached either way.
 
         Returns:
             List[Package]: valid matching packages.
@@ -352,26 +422,105 @@ class NixProvider(PackageManager):
         
         # Check cache first
         cache = SearchCache(self.name)
-        cached = cache.get(query)
+        cached = cache.get(query) if use_cache else None
         if cached is not None:
             return cached
         
+        packages = self._run_search(query)
+        if packages is None:
+            return []
+        
+        # Save to cache
+        cache.set(query, packages)
+        return packages
+
+    def search_many(self, queries: List[str]) -> Dict[str, List[Package]]:
+        """
+        Search for several queries with a single `nix search` evaluation.
+        
+        `nix search` treats its argument as a regex, so uncached queries are
+        joined into one alternation and the results are split back per query
+        the way nix matches them: against the full attribute path, the
+        derivation name and the description, case-insensitively.
+
+        Args:
+            queries: The search queries.
+
+        Returns:
+            Dict[str, List[Package]]: Found packages per query.
+        """
+        unique = list(dict.fromkeys(queries))
+        if not self.is_available():
+            return {q: [] for q in unique}
+        
+        cache = SearchCache(self.name)
+        results: Dict[str, List[Package]] = {}
+        missing: List[str] = []
+        for query in unique:
+            cached = cache.get(query)
+            if cached is not None:
+                results[query] = cached
+            else:
+                missing.append(query)
+        
+        if len(missing) == 1:
+            results[missing[0]] = self.search(missing[0])
+        elif missing:
+            try:
+                patterns = {q: re.compile(q, re.IGNORECASE) for q in missing}
+            except re.error:
+                # Not something we can split results with, search one by one
+                results.update(super().search_many(missing))
+                return {q: results[q] for q in unique}
+            
+            pnames: Dict[str, str] = {}
+            packages = self._run_search("|".join(f"({q})" for q in missing), pnames)
+            for query, pattern in patterns.items():
+                if packages is None:
+                    results[query] = []
+                    continue
+                matched = [
+                    p for p in packages
+                    if pattern.search(p.id)
+                    or pattern.search(pnames.get(p.id, ""))
+                    or pattern.search(p.description or "")
+                ]
+                cache.set(query, matched)
+                results[query] = matched
+        
+        return {q: results[q] for q in unique}
+
+    def _run_search(self, regex: str, pnames: Optional[Dict[str, str]] = None) -> Optional[List[Package]]:
+        """
+        Run `nix search` and parse its JSON output.
+
+        Args:
+            regex: The search regex passed to nix.
+            pnames: If given, filled with each result's derivation name
+                (e.g. "python3.12-foo"), keyed by attribute path.
+
+        Returns:
+            Optional[List[Package]]: Found packages, or None if the search failed.
+        """
         try:
             returncode, stdout, stderr = run_capture(
-                ["nix", "search", "nixpkgs", query, "--json"]
+                ["nix", "search", "nixpkgs", regex, "--json"],
+                timeout=query_timeout()
             )
             
             if returncode != 0:
-                return []
+                return None
             
-            data = json.loads(stdout)
+            data = orjson.loads(stdout)
             packages: List[Package] = []
             
             # Structure: { "legacyPackages.x86_64-linux.pkgName": { "description": "...", "version": "..." } }
             for key, details in data.items():
-                name = key.split('.')[-1]
+                name = key.rpartition('.')[2]
                 version = details.get('version', 'unknown')
                 desc = details.get('description', '')
+                if pnames is not None:
+                    pnames[key] = details.get('pname') or ''
                 
                 packages.append(Package(
                     name=name,
@@ -381,12 +530,10 @@ class NixProvider(PackageManager):
                     description=desc
                 ))
             
-            # Save to cache
-            cache.set(query, packages)
             return packages
 
         except Exception:
-            return []
+            return None
 
     @require_availability
     def clean(self) -> None:
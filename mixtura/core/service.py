@@ -1,13 +1,110 @@
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Optional, Tuple, Dict, Callable, Any, TypeVar
+import os
+import threading
+from typing import List, Optional, Tuple, Dict, Callable, Any, Iterable, Iterator, TypeVar, TYPE_CHECKING
 
 from mixtura.core.concurrency import global_provider_lock
 
 from mixtura.core.package import Package, PackageSpec, OperationResult
-from mixtura.core.providers import get_all_providers, get_available_providers, get_provider
+from mixtura.core.providers import get_available_providers, get_provider, invalidate_availability_cache
 from mixtura.core.providers.base import PackageManager
 
+# concurrent.futures pulls in logging; imported on first use so commands
+# that never fan out (--help, version, clean) don't pay for it at startup.
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+
+def _max_workers() -> int:
+    """
+    Size of the shared executor.
+
+    Provider operations usually spawn a subprocess each, so cap how many run
+    at once. MIXTURA_MAX_WORKERS overrides the CPU-based default.
+
+    Returns:
+        int: The number of worker threads.
+    """
+    try:
+        configured = int(os.environ.get("MIXTURA_MAX_WORKERS", ""))
+    except ValueError:
+        configured = 0
+    return configured if configured > 0 else max(2, os.cpu_count() or 4)
+
+
+MAX_WORKERS = _max_workers()
+
+_executor: Optional["ThreadPoolExecutor"] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> "ThreadPoolExecutor":
+    """
+    Return the process-wide executor for provider operations.
+
+    Created on first use and reused by every PackageService call, so commands
+    don't pay for spinning thread pools up and down.
+
+    Returns:
+        ThreadPoolExecutor: The shared, bounded executor.
+    """
+    global _executor
+    
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="mixtura")
+    return _executor
+
+
+def _completed(futures: Iterable["Future[Any]"]) -> Iterator["Future[Any]"]:
+    """
+    Yield futures as they complete, cancelling the rest if the caller stops early.
+
+    On Ctrl-C (or when a consuming generator is closed) provider calls that
+    haven't started yet are dropped instead of being run to completion in the
+    background.
+
+    Args:
+        futures: The submitted futures.
+
+    Yields:
+        Future: Each future, once it is done.
+    """
+    from concurrent.futures import as_completed
+
+    try:
+        yield from as_completed(futures)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _unique_packages(packages: List[Package]) -> List[Package]:
+    """
+    Drop repeated packages, keeping the first occurrence of each.
+
+    Packages are identified by (provider, id), the pair used to install them;
+    the display name alone is not unique (e.g. the same pname in several Nix
+    package sets).
+
+    Args:
+        packages: Aggregated provider results.
+
+    Returns:
+        List[Package]: The packages without duplicates, in their original order.
+    """
+    seen = set()
+    unique = []
+    for pkg in packages:
+        key = (pkg.provider, pkg.id)
+        if key not in seen:
+            seen.add(key)
+            unique.append(pkg)
+    return unique
+
 
 class PackageService:
     """
@@ -17,9 +114,6 @@ class PackageService:
     
     T = TypeVar("T")
 
-    def __init__(self) -> None:
-        self._providers = get_all_providers()
-
     @staticmethod
     def _run_with_lock(func: Callable[..., "PackageService.T"], *args: Any, **kwargs: Any) -> "PackageService.T":
         """Helper to run a function under shared provider lock."""
@@ -29,38 +123,126 @@ class PackageService:
     def get_provider(self, name: str) -> Optional[PackageManager]:
         return get_provider(name)
 
-    def search(self, query: str) -> List[Package]:
+    def search(self, query: str, use_cache: bool = True) -> List[Package]:
         """
         Search for packages across all available providers.
 
         Args:
             query: The search query string.
+            use_cache: Let providers answer from their search cache.
 
         Returns:
             List[Package]: A list of found packages.
         """
+        return [pkg for batch in self.iter_search(query, use_cache) for pkg in batch]
+
+    def iter_search(self, query: str, use_cache: bool = True) -> Iterator[List[Package]]:
+        """
+        Search across all available providers, yielding results as they arrive.
+
+        Each provider's results are yielded as soon as it finishes, so callers
+        can show fast providers without waiting for the slowest one. Repeated
+        queries are answered by each provider's SearchCache.
+
+        Args:
+            query: The search query string.
+            use_cache: Let providers answer from their search cache.
+
+        Yields:
+            List[Package]: The packages found by one provider.
+        """
         available = get_available_providers()
-        results: List[Package] = []
         
         # Parallel search
-        with ThreadPoolExecutor(max_workers=max(1, len(available))) as executor:
-            futures = {
-                executor.submit(self._run_with_lock, mgr.search, query): mgr 
-                for mgr in available.values()
-            }
-            
-            for future in as_completed(futures):
-                try:
-                    # Providers should return List[Package]
-                    # We accept that failures return empty list
-                    results.extend(future.result())
-                except Exception:
-                    # Log internally if we had a logger, or ignore
-                    # Preventing thread crash from affecting main process
-                    pass
-                    
+        executor = _get_executor()
+        futures = {
+            executor.submit(self._run_with_lock, mgr.search, query, use_cache): mgr 
+            for mgr in available.values()
+        }
+        
+        for future in _completed(futures):
+            try:
+                # Providers should return List[Package]
+                # Duplicates are keyed by provider, so deduping per batch suffices
+                batch = _unique_packages(future.result())
+            except Exception:
+                # We accept that failures return empty list
+                # Preventing thread crash from affecting main process
+                continue
+            if batch:
+                yield batch
+
+    def search_many(self, queries: List[str]) -> Dict[str, List[Package]]:
+        """
+        Search for several queries across all available providers.
+
+        Each provider receives the whole batch in a single call, so providers
+        that can answer many queries at once spawn one process per batch
+        instead of one per query.
+
+        Args:
+            queries: The search query strings.
+
+        Returns:
+            Dict[str, List[Package]]: Found packages per query.
+        """
+        pending = list(dict.fromkeys(queries))
+        results: Dict[str, List[Package]] = {query: [] for query in pending}
+        if not pending:
+            return results
+        
+        available = get_available_providers()
+        executor = _get_executor()
+        futures = [
+            executor.submit(self._run_with_lock, mgr.search_many, pending)
+            for mgr in available.values()
+        ]
+        
+        for future in _completed(futures):
+            try:
+                for query, found in future.result().items():
+                    results[query].extend(found)
+            except Exception:
+                # Same policy as search(): a failing provider contributes nothing
+                pass
+        
+        for query in pending:
+            results[query] = _unique_packages(results[query])
         return results
 
+    def list_installed(self) -> Dict[str, List[Package]]:
+        """
+        List installed packages for every available provider, in parallel.
+
+        A provider whose listing fails contributes an empty list, so one
+        broken provider doesn't hide the others.
+
+        Returns:
+            Dict[str, List[Package]]: Installed packages keyed by provider name.
+        """
+        available = get_available_providers()
+        installed: Dict[str, List[Package]] = {name: [] for name in available}
+        
+        executor = _get_executor()
+        futures = {
+            executor.submit(self._run_with_lock, mgr.list_packages): name
+            for name, mgr in available.items()
+        }
+        
+        for future in _completed(futures):
+            try:
+                installed[futures[future]] = future.result()
+            except Exception:
+                pass
+        
+        return installed
+
+    def _after_change(self, results: List[OperationResult]) -> None:
+        """Re-probe providers once an install or removal succeeded."""
+        if any(r.success for r in results):
+            # The change may have added or removed a provider binary
+            invalidate_availability_cache()
+
     def resolve_package(self, spec: PackageSpec) -> List[Package]:
         """
         Resolve a PackageSpec to concrete found Packages.
@@ -81,12 +263,8 @@ class PackageService:
             # Ideally providers should have 'get' but search is close enough for now.
             try:
                 results = mgr.search(spec.name)
-                # Filter for exact match if possible?
-                # The Orchestrator had smart filter logic. We should reproduce it here or in CLI?
-                # Service should probably return all matches and let CLI decide?
-                # But 'resolve' generally implies finding the specific thing.
-                
-                # Let's simple filter for name match
+                # Smart filtering (globs, --all) lives in mixtura.core.filtering and is
+                # applied by the CLI; 'resolve' only narrows to the exact name.
                 exact = [p for p in results if p.name == spec.name]
                 return exact if exact else results
             except Exception:
@@ -122,37 +300,70 @@ class PackageService:
                 continue
                 
             by_provider.setdefault(spec.provider, []).append(spec.name)
+        
+        # "git,nixpkgs#git" must not install the same package twice
+        by_provider = {prov: list(dict.fromkeys(names)) for prov, names in by_provider.items()}
             
         # Execute in parallel
-        with ThreadPoolExecutor(max_workers=max(1, len(by_provider))) as executor:
-            futures = {}
-            for prov_name, pkg_names in by_provider.items():
-                mgr = get_provider(prov_name)
-                if not mgr or not mgr.is_available():
-                    msg = f"Provider '{prov_name}' not available"
-                    results.append(OperationResult(prov_name, False, msg))
-                    continue
-                    
-                futures[executor.submit(self._run_with_lock, mgr.install, pkg_names)] = (prov_name, pkg_names)
+        executor = _get_executor()
+        futures = {}
+        for prov_name, pkg_names in by_provider.items():
+            mgr = get_provider(prov_name)
+            if not mgr or not mgr.is_available():
+                msg = f"Provider '{prov_name}' not available"
+                results.append(OperationResult(prov_name, False, msg))
+                continue
                 
-            for future in as_completed(futures):
-                prov_name, pkg_names = futures[future]
-                try:
-                    future.result()
-                    results.append(OperationResult(
-                        prov_name, 
-                        True, 
-                        f"Successfully installed: {', '.join(pkg_names)}"
-                    ))
-                except Exception as e:
-                    results.append(OperationResult(
-                        prov_name, 
-                        False, 
-                        f"Failed to install: {str(e)}"
-                    ))
-                    
+            futures[executor.submit(self._run_with_lock, self._install_missing, mgr, pkg_names)] = (prov_name, pkg_names)
+            
+        for future in _completed(futures):
+            prov_name, pkg_names = futures[future]
+            try:
+                installed = future.result()
+                skipped = [name for name in pkg_names if name not in installed]
+                if installed:
+                    msg = f"Successfully installed: {', '.join(installed)}"
+                    if skipped:
+                        msg += f" (already installed: {', '.join(skipped)})"
+                else:
+                    msg = f"Already installed: {', '.join(skipped)}"
+                results.append(OperationResult(prov_name, True, msg))
+            except Exception as e:
+                results.append(OperationResult(
+                    prov_name, 
+                    False, 
+                    f"Failed to install: {str(e)}"
+                ))
+        
+        self._after_change(results)
         return results
 
+    @staticmethod
+    def _install_missing(mgr: PackageManager, pkg_names: List[str]) -> List[str]:
+        """
+        Install the packages a provider doesn't already have.
+
+        Only a still-valid installed snapshot is consulted, never a live
+        listing; without one every package is passed through and the
+        manager decides.
+
+        Args:
+            mgr: The provider to install with.
+            pkg_names: Package names or IDs to install.
+
+        Returns:
+            List[str]: The packages that were actually installed.
+        """
+        pending = pkg_names
+        snapshot = mgr.installed_snapshot()
+        if snapshot:
+            present = {mgr.installed_key(pkg) for pkg in snapshot}
+            pending = [name for name in pkg_names if mgr.install_key(name) not in present]
+        
+        if pending:
+            mgr.install(pending)
+        return pending
+
     def remove(self, specs: List[PackageSpec]) -> List[OperationResult]:
         """
         Remove packages.
@@ -176,24 +387,28 @@ class PackageService:
                 ))
                 continue
             by_provider.setdefault(spec.provider, []).append(spec.name)
+        
+        # A second removal of the same package would only fail
+        by_provider = {prov: list(dict.fromkeys(names)) for prov, names in by_provider.items()}
             
-        with ThreadPoolExecutor(max_workers=max(1, len(by_provider))) as executor:
-            futures = {}
-            for prov_name, pkg_names in by_provider.items():
-                mgr = get_provider(prov_name)
-                if not mgr or not mgr.is_available():
-                    results.append(OperationResult(prov_name, False, "Provider unavailable"))
-                    continue
-                futures[executor.submit(self._run_with_lock, mgr.uninstall, pkg_names)] = prov_name
-                
-            for future in as_completed(futures):
-                prov_name = futures[future]
-                try:
-                    future.result()
-                    results.append(OperationResult(prov_name, True, "Removal successful"))
-                except Exception as e:
-                    results.append(OperationResult(prov_name, False, str(e)))
-                    
+        executor = _get_executor()
+        futures = {}
+        for prov_name, pkg_names in by_provider.items():
+            mgr = get_provider(prov_name)
+            if not mgr or not mgr.is_available():
+                results.append(OperationResult(prov_name, False, "Provider unavailable"))
+                continue
+            futures[executor.submit(self._run_with_lock, mgr.uninstall, pkg_names)] = prov_name
+            
+        for future in _completed(futures):
+            prov_name = futures[future]
+            try:
+                future.result()
+                results.append(OperationResult(prov_name, True, "Removal successful"))
+            except Exception as e:
+                results.append(OperationResult(prov_name, False, str(e)))
+        
+        self._after_change(results)
         return results
 
     def upgrade(self, specs: Optional[List[PackageSpec]] = None) -> List[OperationResult]:
@@ -216,33 +431,73 @@ class PackageService:
         else:
             # Group by provider
             by_provider: Dict[str, List[str]] = {}
+            providers_full: Dict[str, None] = {}
             for spec in specs:
                 if spec.provider and spec.provider != "unknown":
                     by_provider.setdefault(spec.provider, []).append(spec.name)
                 elif spec.name in get_available_providers():
                     # Spec name IS the provider name (e.g. "mixtura upgrade nixpkgs")
-                    target_mgr = get_provider(spec.name)
-                    if target_mgr:
-                        tasks.append((target_mgr, None))
+                    providers_full[spec.name] = None
+
+            # A full upgrade already covers any targeted packages of that provider,
+            # so each provider gets a single upgrade run.
+            for prov in providers_full:
+                by_provider.pop(prov, None)
+                target_mgr = get_provider(prov)
+                if target_mgr:
+                    tasks.append((target_mgr, None))
             
             for prov, names in by_provider.items():
+                names = list(dict.fromkeys(names))
                 p_mgr = get_provider(prov)
-                if p_mgr and p_mgr.is_available():
-                    tasks.append((p_mgr, names))
+                if not p_mgr or not p_mgr.is_available():
+                    results.append(OperationResult(prov, False, f"Provider '{prov}' not available"))
+                    continue
+                tasks.append((p_mgr, names))
                     
         # Execute
-        with ThreadPoolExecutor() as executor:
-            futures = {}
-            for mgr, pkg_names in tasks:
-                futures[executor.submit(self._run_with_lock, mgr.upgrade, pkg_names)] = mgr
-                
-            for future in as_completed(futures):
-                mgr = futures[future]
-                try:
-                    future.result()
-                    msg = "Upgrade successful" if not pkg_names else f"Upgraded {len(pkg_names)} packages"
-                    results.append(OperationResult(mgr.name, True, msg))
-                except Exception as e:
-                    results.append(OperationResult(mgr.name, False, str(e)))
+        executor = _get_executor()
+        futures = {}
+        for mgr, pkg_names in tasks:
+            futures[executor.submit(self._run_with_lock, mgr.upgrade, pkg_names)] = (mgr, pkg_names)
+            
+        for future in _completed(futures):
+            mgr, pkg_names = futures[future]
+            try:
+                future.result()
+                msg = "Upgrade successful" if not pkg_names else f"Upgraded {len(pkg_names)} packages"
+                results.append(OperationResult(mgr.name, True, msg))
+            except Exception as e:
+                results.append(OperationResult(mgr.name, False, str(e)))
+
+        return results
+
+    def clean(self, providers: List[str]) -> List[OperationResult]:
+        """
+        Run each provider's cleanup (garbage collection), in parallel.
+
+        Args:
+            providers: Names of the providers to clean.
 
+        Returns:
+            List[OperationResult]: Results of the cleanup operations.
+        """
+        results: List[OperationResult] = []
+        executor = _get_executor()
+        futures = {}
+        for prov_name in dict.fromkeys(providers):
+            mgr = get_provider(prov_name)
+            if not mgr or not mgr.is_available():
+                results.append(OperationResult(prov_name, False, f"Provider '{prov_name}' not available"))
+                continue
+            futures[executor.submit(self._run_with_lock, mgr.clean)] = prov_name
+        
+        for future in _completed(futures):
+            prov_name = futures[future]
+            try:
+                future.result()
+                results.append(OperationResult(prov_name, True, "Cleaned"))
+            except Exception as e:
+                results.append(OperationResult(prov_name, False, str(e)))
+        
         return results
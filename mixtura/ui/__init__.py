@@ -26,8 +26,9 @@ MIXTURA_THEME = Theme({
     "pkg.version": "dim",
 })
 
-# Global console instance
+# Global console instances
 console = Console(theme=MIXTURA_THEME, highlight=False)
+err_console = Console(theme=MIXTURA_THEME, stderr=True, highlight=False)
 
 # ASCII Logo
 ASCII_LOGO = """[main]
@@ -48,9 +49,19 @@ def log_task(msg: str) -> None:
     console.print(f"[main]==>[/main] {msg}")
 
 
+def format_success(msg: str) -> str:
+    """Return a success message as console markup, without printing it."""
+    return f"[success]✔[/success]  {msg}"
+
+
+def format_error(msg: str) -> str:
+    """Return an error message as console markup, without printing it."""
+    return f"[error]✖  Error:[/error] {msg}"
+
+
 def log_success(msg: str) -> None:
     """Output a success message."""
-    console.print(f"[success]✔[/success]  {msg}")
+    console.print(format_success(msg))
 
 
 def log_warn(msg: str) -> None:
@@ -60,8 +71,7 @@ def log_warn(msg: str) -> None:
 
 def log_error(msg: str) -> None:
     """Output an error message to stderr."""
-    err_console = Console(theme=MIXTURA_THEME, stderr=True, highlight=False)
-    err_console.print(f"[error]✖  Error:[/error] {msg}")
+    err_console.print(format_error(msg))
 
 
 def print_logo() -> None:
@@ -7,14 +7,15 @@ Provides beautiful formatted output for packages and operation results.
 from typing import List, Tuple
 
 from mixtura.core.package import Package
-from mixtura.ui import console, log_success, log_error, log_warn
+from mixtura.ui import console, err_console, format_error, format_success, log_success, log_warn
 
 
 def display_package_list(
     packages: List[Package],
     title: str,
     show_index: bool = True,
-    max_desc_length: int = 60
+    max_desc_length: int = 60,
+    start: int = 1
 ) -> None:
     """
     Display a formatted list of packages using Rich.
@@ -24,11 +25,14 @@ def display_package_list(
         title: Header text to display above the list.
         show_index: Whether to show numbered indices.
         max_desc_length: Maximum description length before truncation.
+        start: Index of the first package. Values above 1 continue a list
+            already on screen, so the header is not repeated.
     """
-    console.print()
-    console.print(f"[main bold]{title}:[/main bold]")
+    # Build the whole listing and print it at once: one write (and one
+    # console lock round-trip) instead of two per package
+    lines = [f"[main bold]{title}:[/main bold]"] if start == 1 else []
     
-    for i, pkg in enumerate(packages, 1):
+    for i, pkg in enumerate(packages, start):
         name = pkg.name
         provider = pkg.provider
         version = pkg.version
@@ -40,12 +44,16 @@ def display_package_list(
         
         # Format output
         if show_index:
-            console.print(f" [success]{i}.[/success] [bold]{name}[/bold] [dim]({provider} {version})[/dim]")
+            lines.append(f" [success]{i}.[/success] [bold]{name}[/bold] [dim]({provider} {version})[/dim]")
         else:
-            console.print(f"  [success]•[/success] [bold]{name}[/bold] [dim]({version})[/dim]")
+            lines.append(f"  [success]•[/success] [bold]{name}[/bold] [dim]({version})[/dim]")
         
         if desc:
-            console.print(f"    {desc}")
+            lines.append(f"    {desc}")
+    
+    if start == 1:
+        console.print()
+    console.print("\n".join(lines))
 
 
 def display_installed_packages(
@@ -63,13 +71,15 @@ def display_installed_packages(
         console.print(f"[dim]No packages found in {provider_name}[/dim]")
         return
     
-    console.print(f"[info bold]:: {provider_name} ({len(packages)})[/info bold]")
+    lines = [f"[info bold]:: {provider_name} ({len(packages)})[/info bold]"]
     
     for pkg in packages:
         name = pkg.name
         extra = pkg.version or pkg.id or pkg.origin or ''
         
-        console.print(f"  [success]•[/success] [bold]{name}[/bold] [dim]({extra})[/dim]")
+        lines.append(f"  [success]•[/success] [bold]{name}[/bold] [dim]({extra})[/dim]")
+    
+    console.print("\n".join(lines))
 
 
 def display_operation_results(
@@ -86,15 +96,16 @@ def display_operation_results(
         partial_msg: Message to show if some failed.
     """
     console.print()
-    success_count = 0
+    # One write per stream instead of one per result
+    successes = [format_success(message) for _, success, message in results if success]
+    errors = [format_error(message) for _, success, message in results if not success]
     
-    for name, success, message in results:
-        if success:
-            log_success(message)
-            success_count += 1
-        else:
-            log_error(message)
+    if successes:
+        console.print("\n".join(successes))
+    if errors:
+        err_console.print("\n".join(errors))
     
+    success_count = len(successes)
     total = len(results)
     if success_count == total:
         log_success(success_msg)
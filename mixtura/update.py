@@ -4,25 +4,56 @@ Update checker for Mixtura.
 Checks for new versions on GitHub.
 """
 
-import hashlib
 import os
 import sys
-import urllib.request
-import json
-import base64
-import ssl
-import stat
+import time
+from pathlib import Path
 
 from mixtura.ui import console
 
 
+# How often the startup update check may hit the network, and the file whose
+# mtime records the last check.
+UPDATE_CHECK_INTERVAL = 24 * 60 * 60  # 1 day
+UPDATE_STAMP_FILE = Path.home() / "mixtura" / "cache" / ".update_check"
+
+
 def is_nuitka_compiled() -> bool:
     """Detects if the application is running as a Nuitka compiled executable."""
     return "__compiled__" in globals() or getattr(sys, 'frozen', False) or hasattr(sys, '_MEIPASS')
 
 
+def update_check_due() -> bool:
+    """Returns True if the last update check is older than UPDATE_CHECK_INTERVAL."""
+    try:
+        return time.time() - UPDATE_STAMP_FILE.stat().st_mtime > UPDATE_CHECK_INTERVAL
+    except OSError:
+        # No stamp yet (or unreadable): check now
+        return True
+
+
+def mark_update_checked() -> None:
+    """Records that an update check just ran."""
+    try:
+        UPDATE_STAMP_FILE.parent.mkdir(parents=True, exist_ok=True)
+        UPDATE_STAMP_FILE.touch()
+    except OSError:
+        # A missing stamp only means we check again next time.
+        pass
+
+
 def check_for_updates() -> None:
     """Checks if there is a new version available by comparing versions."""
+    # The network stack (urllib/http.client/ssl) is imported here rather than at
+    # module level, so commands that skip the update check don't pay for it.
+    import base64
+    import hashlib
+    import json
+    import ssl
+    import stat
+    import urllib.error
+    import urllib.request
+
     is_compiled = is_nuitka_compiled()
     
     github_version_url = "https://api.github.com/repos/miguel-b-p/mixtura/contents/bin/VERSION"
@@ -9,6 +9,7 @@ import os
 import sys
 import subprocess
 import shlex
+import threading
 from typing import List, Optional, Tuple, Dict
 
 from mixtura.ui import console, log_error, log_info, log_warn
@@ -37,6 +38,24 @@ class CommandError(Exception):
 # System Helpers
 # -----------------------------------------------------------------------------
 
+def query_timeout() -> Optional[int]:
+    """
+    Timeout for read-only provider queries (search, list), in seconds.
+
+    Read from MIXTURA_PROVIDER_TIMEOUT. Unset or invalid means no limit,
+    since a first `nix search` may legitimately spend minutes fetching nixpkgs.
+    A query that runs over is killed, so one hung provider can't stall the rest.
+
+    Returns:
+        Optional[int]: The timeout, or None for no limit.
+    """
+    try:
+        timeout = int(os.environ.get("MIXTURA_PROVIDER_TIMEOUT", ""))
+    except ValueError:
+        return None
+    return timeout if timeout > 0 else None
+
+
 def run(
     cmd: List[str],
     silent: bool = False,
@@ -93,28 +112,15 @@ def run(
         run_env.update(env)
 
     try:
-        # If we need to check warnings, we must capture output
+        # If we need to check warnings, we must capture output (relayed as it arrives)
         if check_warnings:
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                cwd=cwd,
-                env=run_env,
-                timeout=timeout,
-                shell=False
+            returncode, err_output = _run_streaming(
+                cmd, cwd=cwd, env=run_env, timeout=timeout, show_output=show_output
             )
             
-            if show_output:
-                if result.stdout:
-                    print(result.stdout, end='')
-                if result.stderr:
-                    print(result.stderr, file=sys.stderr, end='')
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd)
             
-            if result.returncode != 0:
-                raise subprocess.CalledProcessError(result.returncode, cmd)
-            
-            err_output = result.stderr
             if "does not match any packages" in err_output or "No packages to" in err_output:
                 raise subprocess.CalledProcessError(1, cmd)
         else:
@@ -151,6 +157,82 @@ def run(
         raise CommandError("Operation cancelled by user.", returncode=130, cmd=cmd_str)
 
 
+def _run_streaming(
+    cmd: List[str],
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[int] = None,
+    show_output: bool = True
+) -> Tuple[int, str]:
+    """
+    Execute a command, relaying its output line by line while capturing stderr.
+    
+    Long operations (e.g. `nix profile upgrade`) show progress as it happens
+    instead of all at once when the process exits.
+
+    Args:
+        cmd: Command and arguments as a list.
+        cwd: Working directory for the command.
+        env: Full environment for the command (None = inherit).
+        timeout: Timeout in seconds (None = no timeout).
+        show_output: If True, echo stdout/stderr as lines arrive.
+
+    Returns:
+        Tuple[int, str]: The return code and the captured stderr.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command exceeds the timeout.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+        cwd=cwd,
+        env=env,
+        shell=False
+    )
+    err_lines: List[str] = []
+    timed_out = threading.Event()
+    
+    def _relay_stderr() -> None:
+        assert proc.stderr is not None
+        for line in proc.stderr:
+            err_lines.append(line)
+            if show_output:
+                print(line, file=sys.stderr, end='', flush=True)
+    
+    def _kill() -> None:
+        timed_out.set()
+        proc.kill()
+    
+    err_thread = threading.Thread(target=_relay_stderr, daemon=True)
+    err_thread.start()
+    timer = threading.Timer(timeout, _kill) if timeout else None
+    if timer:
+        timer.start()
+    
+    try:
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            if show_output:
+                print(line, end='', flush=True)
+        returncode = proc.wait()
+        err_thread.join()
+    finally:
+        if timer:
+            timer.cancel()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout or 0)
+    
+    return returncode, "".join(err_lines)
+
+
 def run_capture(
     cmd: List[str],
     cwd: Optional[str] = None,
@@ -9,6 +9,14 @@ from unittest.mock import MagicMock, patch
 from mixtura.core.package import Package
 
 
+@pytest.fixture(autouse=True)
+def update_stamp(tmp_path, monkeypatch):
+    """Keep the update-check stamp out of the real home directory."""
+    stamp = tmp_path / ".update_check"
+    monkeypatch.setattr('mixtura.update.UPDATE_STAMP_FILE', stamp)
+    return stamp
+
+
 @pytest.fixture
 def cli_runner():
     """Provide a Typer CLI runner for testing commands."""
@@ -5,156 +5,260 @@ Tests the SearchCache functionality for caching package search results.
 """
 
 import json
-import tempfile
+import mmap
+import os
 import time
 from pathlib import Path
 from unittest.mock import patch
 
-from mixtura.cache import SearchCache
+import pytest
+
+from mixtura.cache import InstalledCache, SearchCache
 from mixtura.core.package import Package
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Redirect the cache root to a temporary directory."""
+    monkeypatch.setattr(SearchCache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(SearchCache, "_memory", {})
+    return tmp_path / "cache"
+
+
 class TestSearchCacheInit:
     """Test SearchCache initialization."""
-    
-    def test_cache_creates_directory(self):
+
+    def test_cache_creates_directory(self, cache_dir):
         """Test that cache creates its directory if it doesn't exist."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with patch.object(Path, 'home', return_value=Path(tmpdir)):
-                cache = SearchCache("test_provider")
-                # Directory should be created in initialization or on first access
-                assert cache is not None
-    
+        cache = SearchCache("test_provider")
+        assert cache.cache_dir.is_dir()
+        assert cache.cache_dir == cache_dir / "test_provider"
+
     def test_cache_uses_provider_name(self):
         """Test that cache uses provider name in file path."""
         cache = SearchCache("nixpkgs")
-        assert "nixpkgs" in str(cache.cache_file) or cache.provider == "nixpkgs"
+        assert cache.cache_dir.name == "nixpkgs"
+        assert cache.provider_name == "nixpkgs"
+
+    def test_entry_path_is_per_query(self):
+        """Test that each query maps to its own file."""
+        cache = SearchCache("nixpkgs")
+        assert cache._entry_path("git") != cache._entry_path("vim")
+        assert cache._entry_path("git") == cache._entry_path("git")
+        assert cache._entry_path("git").parent == cache.cache_dir
 
 
 class TestSearchCacheOperations:
     """Test cache get/set operations."""
-    
+
     def test_get_returns_none_for_missing(self):
         """Test that get returns None for non-existent keys."""
-        # Create a fresh cache for a nonexistent provider
         cache = SearchCache("test_nonexistent_provider_abc123")
-        
+
         result = cache.get("nonexistent_query_xyz")
         assert result is None
-    
+
     def test_set_and_get_packages(self):
         """Test setting and getting package results."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cache_file = Path(tmpdir) / "cache" / "test_cache.json"
-            cache_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            cache = SearchCache("test")
-            cache.cache_file = cache_file
-            
-            packages = [
-                Package(name="git", provider="nixpkgs", id="git", version="2.43.0"),
-                Package(name="vim", provider="nixpkgs", id="vim", version="9.1.0"),
-            ]
-            
-            cache.set("git", packages)
-            
-            # Get should return the cached packages
-            result = cache.get("git")
-            
-            assert result is not None
-            assert len(result) == 2
-            assert result[0].name == "git"
-            assert result[1].name == "vim"
-    
+        cache = SearchCache("test")
+
+        packages = [
+            Package(name="git", provider="nixpkgs", id="git", version="2.43.0"),
+            Package(name="vim", provider="nixpkgs", id="vim", version="9.1.0"),
+        ]
+
+        cache.set("git", packages)
+
+        # Get should return the cached packages
+        result = cache.get("git")
+
+        assert result is not None
+        assert len(result) == 2
+        assert result[0].name == "git"
+        assert result[1].name == "vim"
+
+    def test_get_reuses_decoded_entry_across_instances(self):
+        """Test that an entry is decoded at most once per process."""
+        SearchCache("test").set("git", [Package(name="git", provider="nixpkgs", id="git")])
+        SearchCache._memory.clear()
+
+        with patch.object(SearchCache, '_load_entry', wraps=SearchCache("test")._load_entry) as mock_load:
+            first = SearchCache("test").get("git")
+            second = SearchCache("test").get("git")
+
+        assert mock_load.call_count == 1
+        assert first is not None and second is not None
+        assert first[0].name == second[0].name == "git"
+
+    def test_set_does_not_touch_other_entries(self):
+        """Test that writing one query leaves other entries untouched."""
+        cache = SearchCache("test")
+        cache.set("git", [Package(name="git", provider="nixpkgs", id="git")])
+        git_entry = cache._entry_path("git")
+        before = git_entry.read_bytes()
+
+        cache.set("vim", [Package(name="vim", provider="nixpkgs", id="vim")])
+
+        assert git_entry.read_bytes() == before
+        assert len(list(cache.cache_dir.iterdir())) == 2
+
     def test_cache_expiry(self):
         """Test that cached entries expire after TTL."""
-        
+
         cache = SearchCache("test_expiry_provider")
-        
+
         packages = [
             Package(name="git", provider="nixpkgs", id="git", version="2.43.0"),
         ]
-        
-        # Write expired entry directly to cache file
+
+        # Write entry directly to cache file and age it past the TTL
         expired_time = time.time() - 600  # 10 minutes ago (TTL is 5 min)
-        cache_data = {
-            "expired_query": {
-                "timestamp": expired_time,
-                "results": [pkg.to_dict() for pkg in packages]
-            }
-        }
-        cache.cache_file.parent.mkdir(parents=True, exist_ok=True)
-        cache.cache_file.write_text(json.dumps(cache_data))
-        
-        # Should return None for expired entry
-        result = cache.get("expired_query")
+        path = cache._entry_path("expired_query")
+        path.write_text(json.dumps([pkg.to_dict() for pkg in packages]))
+        os.utime(path, (expired_time, expired_time))
+
+        # Should return None for expired entry, without decoding it
+        with patch.object(cache, '_load_entry') as mock_load:
+            result = cache.get("expired_query")
+        mock_load.assert_not_called()
         assert result is None  # Expired entries return None
+        assert not path.exists()
 
 
 class TestSearchCacheClear:
     """Test cache clearing."""
-    
-    def test_clear_removes_cache_file(self):
-        """Test that clear removes the cache file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cache_file = Path(tmpdir) / "test_cache.json"
-            cache_file.write_text("{}")
-            
-            cache = SearchCache("test")
-            cache.cache_file = cache_file
-            
-            assert cache_file.exists()
-            
-            cache.clear()
-            
-            # File should be gone or empty after clear
-            # (Implementation may vary)
+
+    def test_clear_removes_cache_files(self):
+        """Test that clear removes the cache entries."""
+        cache = SearchCache("test")
+        cache.set("git", [Package(name="git", provider="nixpkgs", id="git")])
+
+        assert cache._entry_path("git").exists()
+
+        cache.clear()
+
+        assert not cache._entry_path("git").exists()
+        assert cache.get("git") is None
+
+    def test_clear_expired_keeps_fresh_entries(self):
+        """Test that clear_expired only removes stale entries."""
+        cache = SearchCache("test")
+        cache.set("fresh", [])
+        stale = cache._entry_path("stale")
+        stale.write_text("[]")
+        os.utime(stale, (time.time() - 600, time.time() - 600))
+
+        cache.clear_expired()
+
+        assert cache._entry_path("fresh").exists()
+        assert not stale.exists()
+
+
+    @pytest.mark.parametrize("name", ["/", "..", "../.."])
+    def test_clear_refuses_paths_outside_cache_dir(self, cache_dir, name):
+        """Test that a provider name can't point clear() outside CACHE_DIR."""
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        (cache_dir / "keep").write_text("x")
+        
+        with patch("mixtura.cache.shutil.rmtree") as mock_rmtree:
+            SearchCache(name).clear()
+            InstalledCache(name).clear()
+        
+        mock_rmtree.assert_not_called()
+        assert (cache_dir / "keep").exists()
 
 
 class TestSearchCacheEdgeCases:
     """Test edge cases and error handling."""
-    
+
     def test_get_handles_corrupted_file(self):
         """Test that get handles corrupted cache files gracefully."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cache_file = Path(tmpdir) / "corrupted_cache.json"
-            cache_file.write_text("not valid json {{{")
-            
-            cache = SearchCache("test")
-            cache.cache_file = cache_file
-            
-            # Should not crash, should return None
-            result = cache.get("query")
-            assert result is None
-    
+        cache = SearchCache("test")
+        cache._entry_path("query").write_text("not valid json {{{")
+
+        # Should not crash, should return None
+        result = cache.get("query")
+        assert result is None
+
     def test_set_handles_write_errors(self):
         """Test that set handles write errors gracefully."""
         cache = SearchCache("test")
-        
+
         # Use a path that might not be writable
-        with patch.object(cache, 'cache_file', Path("/nonexistent/readonly/path.json")):
+        with patch.object(cache, 'cache_dir', Path("/nonexistent/readonly")):
             packages = [
                 Package(name="test", provider="test", id="test", version="1.0"),
             ]
-            
+
             # Should not crash even if write fails
-            try:
-                cache.set("query", packages)
-            except OSError:
-                pass  # Some implementations may raise, some may not
-    
+            cache.set("query", packages)
+
+    def test_failed_replace_keeps_previous_entry(self):
+        """Test that a failed write leaves the old entry and no temp file."""
+        cache = SearchCache("test")
+        cache.set("git", [Package(name="git", provider="nixpkgs", id="git")])
+        before = cache._entry_path("git").read_bytes()
+
+        with patch("mixtura.cache.os.replace", side_effect=OSError("disk full")):
+            cache.set("git", [])
+
+        assert cache._entry_path("git").read_bytes() == before
+        assert list(cache.cache_dir.iterdir()) == [cache._entry_path("git")]
+
+    def test_large_entry_read_via_mmap(self, monkeypatch):
+        """Test that entries above the mmap threshold round-trip correctly."""
+        monkeypatch.setattr(SearchCache, "MMAP_THRESHOLD", 1)
+        cache = SearchCache("test")
+        cache.set("git", [Package(name="git", provider="nixpkgs", id="git")])
+        SearchCache._memory.clear()
+
+        with patch("mixtura.cache.mmap.mmap", wraps=mmap.mmap) as mock_mmap:
+            result = cache.get("git")
+
+        mock_mmap.assert_called_once()
+        assert result is not None
+        assert result[0].name == "git"
+
     def test_empty_results_cached(self):
         """Test that empty results can be cached."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            cache_file = Path(tmpdir) / "cache" / "empty_cache.json"
-            cache_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            cache = SearchCache("test")
-            cache.cache_file = cache_file
-            
-            # Cache empty results
-            cache.set("no_results_query", [])
-            
-            result = cache.get("no_results_query")
-            # Empty list should be cached and returned
-            assert result == [] or result is None  # Depends on implementation
+        cache = SearchCache("test")
+
+        # Cache empty results
+        cache.set("no_results_query", [])
+
+        result = cache.get("no_results_query")
+        # Empty list should be cached and returned
+        assert result == []
+
+
+class TestInstalledCache:
+    """Test installed-package snapshots."""
+
+    def test_round_trip_under_same_signature(self, cache_dir):
+        """Test that a snapshot is returned while the signature matches."""
+        cache = InstalledCache("nixpkgs")
+        cache.set("/nix/store/abc-profile", [Package(name="git", provider="nixpkgs", id="git", installed=True)])
+
+        result = InstalledCache("nixpkgs").get("/nix/store/abc-profile")
+
+        assert cache.path == cache_dir / "installed" / "nixpkgs.json"
+        assert result is not None
+        assert result[0].name == "git"
+        assert result[0].installed is True
+
+    def test_stale_signature_misses(self):
+        """Test that a changed signature invalidates the snapshot."""
+        cache = InstalledCache("nixpkgs")
+        cache.set("old", [Package(name="git", provider="nixpkgs", id="git")])
+
+        assert cache.get("new") is None
+
+    def test_search_cache_clear_expired_ignores_snapshots(self):
+        """Test that snapshots have no TTL and survive search cache cleanup."""
+        cache = InstalledCache("nixpkgs")
+        cache.set("sig", [Package(name="git", provider="nixpkgs", id="git")])
+        os.utime(cache.path, (time.time() - 600, time.time() - 600))
+
+        SearchCache("nixpkgs").clear_expired()
+
+        assert cache.get("sig") is not None
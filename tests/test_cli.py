@@ -46,6 +46,32 @@ class TestCLIHelp:
         assert result.exit_code == 0
         assert "Mixtura" in result.stdout or "version" in result.stdout.lower()
 
+    def test_version_file_read_once(self, cli_runner):
+        """Test that the VERSION file is read once per process."""
+        from mixtura.cli import _get_version
+        _get_version.cache_clear()
+        with patch('mixtura.cli.Path.read_text', return_value="9.9\n") as mock_read:
+            cli_runner.invoke(app, ["--version"])
+            result = cli_runner.invoke(app, ["--version"])
+        _get_version.cache_clear()
+        
+        mock_read.assert_called_once()
+        assert "9.9" in result.stdout
+
+
+class TestUpdateCheck:
+    """Test the startup update check gate."""
+    
+    @patch('mixtura.cli.check_for_updates')
+    def test_update_check_runs_once_per_interval(self, mock_update, mock_service, cli_runner):
+        """Test that a second invocation skips the network update check."""
+        mock_service.upgrade.return_value = []
+        
+        cli_runner.invoke(app, ["upgrade"])
+        cli_runner.invoke(app, ["upgrade"])
+        
+        mock_update.assert_called_once()
+
 
 class TestAddCommand:
     """Test the 'add' command."""
@@ -55,14 +81,14 @@ class TestAddCommand:
         """Test add with a package name."""
         # Setup mock behavior
         pkg = Package("git", "nixpkgs", "git")
-        mock_service.search.return_value = [pkg]
+        mock_service.search_many.return_value = {"git": [pkg]}
         mock_service.install.return_value = [OperationResult("nixpkgs", True, "Success")]
         
         # We also need to mock select_package or use --yes, otherwise prompt appears
         with patch('mixtura.cli.select_package', return_value=[pkg]):
             cli_runner.invoke(app, ["add", "git"])
         
-        mock_service.search.assert_called_with("git")
+        mock_service.search_many.assert_called_once_with(["git"])
         mock_service.install.assert_called_once()
         args = mock_service.install.call_args[0][0] # params_for_install
         assert args[0].name == "git"
@@ -76,17 +102,71 @@ class TestAddCommand:
         cli_runner.invoke(app, ["add", "nixpkgs#vim"])
         
         # Should not search, direct install
-        mock_service.search.assert_not_called()
+        mock_service.search_many.assert_not_called()
         mock_service.install.assert_called_once()
         args = mock_service.install.call_args[0][0]
         assert args[0].name == "vim"
         assert args[0].provider == "nixpkgs"
 
+    @patch('mixtura.cli.check_for_updates')
+    def test_add_searches_each_ambiguous_name_once(self, mock_update, mock_service, mock_results, cli_runner):
+        """Test that ambiguous names are searched in one batch, then installed in order."""
+        mock_service.search_many.side_effect = lambda names: {n: [Package(n, "nixpkgs", n)] for n in names}
+        mock_service.install.return_value = [OperationResult("nixpkgs", True, "Success")]
+        
+        cli_runner.invoke(app, ["add", "--yes", "git,vim", "git", "flatpak#Spotify"])
+        
+        mock_service.search_many.assert_called_once_with(["git", "vim"])
+        args = mock_service.install.call_args[0][0]
+        assert [str(spec) for spec in args] == ["nixpkgs#git", "nixpkgs#vim", "nixpkgs#git", "flatpak#Spotify"]
+
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.get_available_providers')
+    def test_add_infers_provider_from_unambiguous_ids(self, mock_available, mock_update, mock_service, mock_results, cli_runner):
+        """Test Flatpak app IDs and brew tap formulae skip the search fan-out."""
+        mock_available.return_value = {"flatpak": MagicMock(), "homebrew": MagicMock()}
+        mock_service.install.return_value = [OperationResult("flatpak", True, "Success")]
+        
+        cli_runner.invoke(app, ["add", "com.spotify.Client", "user/tap/tool"])
+        
+        mock_service.search_many.assert_not_called()
+        args = mock_service.install.call_args[0][0]
+        assert [str(spec) for spec in args] == ["flatpak#com.spotify.Client", "homebrew#user/tap/tool"]
+
+    @patch('mixtura.cli.check_for_updates')
+    def test_add_skips_invalid_specs(self, mock_update, mock_service, mock_results, cli_runner):
+        """Test that half-empty provider#package tokens are rejected before any work."""
+        mock_service.install.return_value = [OperationResult("nixpkgs", True, "Success")]
+        
+        with patch('mixtura.cli.log_error') as mock_error:
+            cli_runner.invoke(app, ["add", "flatpak#,#git", "nixpkgs#vim"])
+        
+        assert mock_error.call_count == 2
+        mock_service.search_many.assert_not_called()
+        args = mock_service.install.call_args[0][0]
+        assert [str(spec) for spec in args] == ["nixpkgs#vim"]
+
+    @patch('mixtura.cli.check_for_updates')
+    def test_add_single_exact_match_skips_prompt(self, mock_update, mock_service, mock_results, cli_runner):
+        """Test a lone exact match is installed without prompting unless --no-auto."""
+        pkg = Package("git", "nixpkgs", "git")
+        mock_service.search_many.return_value = {"git": [pkg, Package("gitui", "nixpkgs", "gitui")]}
+        mock_service.install.return_value = []
+        
+        with patch('mixtura.cli.select_package') as mock_select:
+            cli_runner.invoke(app, ["add", "git"])
+            mock_select.assert_not_called()
+        assert [str(spec) for spec in mock_service.install.call_args[0][0]] == ["nixpkgs#git"]
+        
+        with patch('mixtura.cli.select_package', return_value=None) as mock_select:
+            cli_runner.invoke(app, ["add", "--no-auto", "git"])
+            mock_select.assert_called_once()
+
     @patch('mixtura.cli.check_for_updates')
     def test_add_auto_confirm(self, mock_update, mock_service, mock_results, cli_runner):
         """Test add with --yes flag."""
         pkg = Package("git", "nixpkgs", "git")
-        mock_service.search.return_value = [pkg]
+        mock_service.search_many.return_value = {"git": [pkg]}
         mock_service.install.return_value = []
         
         cli_runner.invoke(app, ["add", "--yes", "git"])
@@ -104,11 +184,8 @@ class TestRemoveCommand:
         """Test remove with search for installed package."""
         pkg = Package("git", "nixpkgs", "git")
         
-        # Mocking get_provider to simulate installed check loop
-        mock_mgr = MagicMock()
-        mock_mgr.is_available.return_value = True
-        mock_mgr.list_packages.return_value = [pkg]
-        mock_service.get_provider.return_value = mock_mgr
+        # Installed packages per provider, as listed by the service
+        mock_service.list_installed.return_value = {"nixpkgs": [pkg]}
         
         mock_service.remove.return_value = [OperationResult("nixpkgs", True, "Success")]
         
@@ -121,6 +198,21 @@ class TestRemoveCommand:
         assert args[0].name == "git"
 
 
+    @patch('mixtura.cli.check_for_updates')
+    def test_remove_lists_installed_once(self, mock_update, mock_service, mock_results, cli_runner):
+        """Test that installed packages are listed once and each package is queued once."""
+        mock_service.list_installed.return_value = {
+            "nixpkgs": [Package("git", "nixpkgs", "git"), Package("vim", "nixpkgs", "vim")],
+        }
+        mock_service.remove.return_value = [OperationResult("nixpkgs", True, "Success")]
+        
+        cli_runner.invoke(app, ["remove", "--yes", "git,vim", "GIT", "nixpkgs#vim"])
+        
+        mock_service.list_installed.assert_called_once()
+        args = mock_service.remove.call_args[0][0]
+        assert [spec.name for spec in args] == ["git", "vim"]
+
+
 class TestUpgradeCommand:
     """Test the 'upgrade' command."""
     
@@ -151,18 +243,31 @@ class TestListCommand:
     @patch('mixtura.cli.get_available_providers')
     @patch('mixtura.cli.display_installed_packages')
     def test_list_all(self, mock_display, mock_available, mock_update, mock_service, cli_runner):
-        """Test list all."""
+        """Test list all goes through the service's parallel listing, in provider order."""
+        mock_available.return_value = {"nixpkgs": MagicMock(), "flatpak": MagicMock()}
+        pkg = Package("firefox", "flatpak", "org.mozilla.firefox")
+        mock_service.list_installed.return_value = {"nixpkgs": [], "flatpak": [pkg]}
+        
+        cli_runner.invoke(app, ["list"])
+        
+        mock_service.list_installed.assert_called_once()
+        assert [c.args for c in mock_display.call_args_list] == [([], "nixpkgs"), ([pkg], "flatpak")]
+
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.display_installed_packages')
+    def test_list_single_provider(self, mock_display, mock_update, mock_service, cli_runner):
+        """Test list with a provider lists only that provider."""
         mock_mgr = MagicMock()
         mock_mgr.name = "nixpkgs"
         mock_mgr.is_available.return_value = True
         mock_mgr.list_packages.return_value = []
+        mock_service.get_provider.return_value = mock_mgr
         
-        mock_available.return_value = {"nixpkgs": mock_mgr}
-        
-        cli_runner.invoke(app, ["list"])
+        cli_runner.invoke(app, ["list", "nixpkgs"])
         
         mock_mgr.list_packages.assert_called_once()
-        mock_display.assert_called_once()
+        mock_service.list_installed.assert_not_called()
+        mock_display.assert_called_once_with([], "nixpkgs")
 
 
 class TestSearchCommand:
@@ -172,12 +277,47 @@ class TestSearchCommand:
     @patch('mixtura.cli.display_package_list')
     def test_search_query(self, mock_display, mock_update, mock_service, cli_runner):
         """Test search query."""
-        mock_service.search.return_value = [Package("git", "nixpkgs", "git")]
+        mock_service.iter_search.return_value = iter([[Package("git", "nixpkgs", "git")]])
         
         cli_runner.invoke(app, ["search", "git"])
-        mock_service.search.assert_called_with("git")
+        mock_service.iter_search.assert_called_with("git", use_cache=True)
         mock_display.assert_called_once()
 
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.display_package_list')
+    def test_search_streams_batches_with_continued_numbering(self, mock_display, mock_update, mock_service, cli_runner):
+        """Test provider batches are shown as they arrive, numbered as one list."""
+        mock_service.iter_search.return_value = iter([
+            [Package("neovim-qt", "nixpkgs", "neovim-qt"), Package("neovim", "nixpkgs", "neovim")],
+            [Package("neovim-gtk", "flatpak", "org.neovim.gtk")],
+        ])
+        
+        cli_runner.invoke(app, ["search", "neovim-*"])
+        
+        calls = mock_display.call_args_list
+        assert [[p.name for p in c.args[0]] for c in calls] == [["neovim-qt"], ["neovim-gtk"]]
+        assert [c.kwargs["start"] for c in calls] == [1, 2]
+
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.display_package_list')
+    def test_search_no_cache_bypasses_caches(self, mock_display, mock_update, mock_service, cli_runner):
+        """Test --no-cache asks the providers to skip cached search results."""
+        mock_service.iter_search.return_value = iter([[Package("git", "nixpkgs", "git")]])
+        
+        cli_runner.invoke(app, ["search", "--no-cache", "git"])
+        
+        mock_service.iter_search.assert_called_with("git", use_cache=False)
+
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.display_package_list')
+    def test_search_no_cache_with_explicit_provider(self, mock_display, mock_update, mock_service, cli_runner):
+        """Test --no-cache reaches a provider searched directly."""
+        mock_service.get_provider.return_value.search.return_value = []
+        
+        cli_runner.invoke(app, ["search", "--no-cache", "flatpak#spotify"])
+        
+        mock_service.get_provider.return_value.search.assert_called_once_with("spotify", use_cache=False)
+
 
 class TestCleanCommand:
     """Test the 'clean' command."""
@@ -187,9 +327,76 @@ class TestCleanCommand:
     @patch('mixtura.cli.display_operation_results')
     def test_clean_all(self, mock_results, mock_available, mock_update, mock_service, cli_runner):
         """Test clean all."""
+        mock_available.return_value = {"nixpkgs": MagicMock(), "flatpak": MagicMock()}
+        mock_service.clean.return_value = [OperationResult("nixpkgs", True, "Cleaned")]
+        
+        cli_runner.invoke(app, ["clean"])
+        mock_service.clean.assert_called_once_with(["nixpkgs", "flatpak"])
+        mock_results.assert_called_once()
+
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.get_available_providers')
+    @patch('mixtura.cli.display_operation_results')
+    def test_clean_skips_unavailable_modules(self, mock_results, mock_available, mock_update, mock_service, cli_runner):
+        """Test clean warns about unavailable providers and cleans the rest."""
+        mock_available.return_value = {"nixpkgs": MagicMock()}
+        mock_service.clean.return_value = []
+        
+        result = cli_runner.invoke(app, ["clean", "nixpkgs", "homebrew"])
+        assert "homebrew" in result.output
+        mock_service.clean.assert_called_once_with(["nixpkgs"])
+
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.get_available_providers')
+    def test_clean_cache_only_clears_search_cache(self, mock_available, mock_update, mock_service, cli_runner):
+        """Test clean --cache drops cached searches without garbage collection."""
         mock_mgr = MagicMock()
-        mock_mgr.name = "nixpkgs"
         mock_available.return_value = {"nixpkgs": mock_mgr}
         
-        cli_runner.invoke(app, ["clean"])
-        mock_mgr.clean.assert_called_once()
+        with patch('mixtura.cache.SearchCache') as mock_cache, \
+             patch('mixtura.cache.InstalledCache') as mock_installed:
+            cli_runner.invoke(app, ["clean", "--cache", "nixpkgs"])
+        
+        mock_cache.assert_called_once_with("nixpkgs")
+        mock_cache.return_value.clear.assert_called_once()
+        mock_installed.assert_called_once_with("nixpkgs")
+        mock_installed.return_value.clear.assert_called_once()
+        mock_mgr.clean.assert_not_called()
+
+    @patch('mixtura.cli.check_for_updates')
+    def test_clean_cache_rejects_unknown_providers(self, mock_update, mock_service, cli_runner):
+        """Test clean --cache only touches registered providers' caches."""
+        with patch('mixtura.cache.SearchCache') as mock_cache, \
+             patch('mixtura.cache.InstalledCache') as mock_installed:
+            result = cli_runner.invoke(app, ["clean", "--cache", "/", "..", "nixpkgs"])
+        
+        assert "Unknown provider '/'" in result.output
+        assert "Unknown provider '..'" in result.output
+        mock_cache.assert_called_once_with("nixpkgs")
+        mock_installed.assert_called_once_with("nixpkgs")
+
+    @patch('mixtura.cli.check_for_updates')
+    def test_clean_cache_with_only_unknown_names_clears_nothing(self, mock_update, mock_service, cli_runner):
+        """Test a typo doesn't report a cleared cache."""
+        with patch('mixtura.cache.SearchCache') as mock_cache:
+            result = cli_runner.invoke(app, ["clean", "--cache", "nixpgks"])
+        
+        mock_cache.assert_not_called()
+        assert "Cache cleared." not in result.output
+
+
+class TestInfoCommand:
+    """Test the 'info' command."""
+    
+    @patch('mixtura.cli.check_for_updates')
+    @patch('mixtura.cli.get_available_providers')
+    @patch('mixtura.cli.get_all_providers')
+    def test_info_marks_available_providers(self, mock_all, mock_available, mock_update, cli_runner):
+        """Test info lists every provider and which ones are installed."""
+        mock_all.return_value = {"nixpkgs": MagicMock(), "homebrew": MagicMock()}
+        mock_available.return_value = {"nixpkgs": mock_all.return_value["nixpkgs"]}
+        
+        result = cli_runner.invoke(app, ["info"])
+        assert result.exit_code == 0
+        assert "nixpkgs (available)" in result.output
+        assert "homebrew (not installed)" in result.output
@@ -142,5 +142,84 @@ class TestProviderLock(unittest.TestCase):
         a_excl_idx = events.index("A_exclusive")
         self.assertLess(b_finish_idx, a_excl_idx)
 
+    def test_queued_writers_hand_off_then_readers_resume(self):
+        """Test that writers queued behind a reader each get a turn, then readers proceed."""
+        events = []
+        reader_holding = threading.Event()
+        release_reader = threading.Event()
+        
+        def first_reader():
+            with self.lock.shared():
+                reader_holding.set()
+                release_reader.wait()
+                
+        def writer(name):
+            with self.lock.exclusive():
+                events.append(name)
+                
+        def late_reader():
+            with self.lock.shared():
+                events.append("reader")
+                
+        t_first = threading.Thread(target=first_reader)
+        t_first.start()
+        reader_holding.wait()
+        
+        writers = [threading.Thread(target=writer, args=(f"W{i}",)) for i in range(3)]
+        for t in writers:
+            t.start()
+        time.sleep(0.05)  # Let the writers queue up
+        t_late = threading.Thread(target=late_reader)
+        t_late.start()
+        time.sleep(0.05)
+        
+        release_reader.set()
+        for t in [t_first, *writers, t_late]:
+            t.join(timeout=2)
+            self.assertFalse(t.is_alive())
+        
+        # Writers queued first go before the late reader
+        self.assertEqual(sorted(events[:3]), ["W0", "W1", "W2"])
+        self.assertEqual(events[3], "reader")
+
+    def test_reentrant_shared_does_not_take_mutex(self):
+        """Test that nested shared acquires by a reader skip the internal mutex."""
+        holding = threading.Event()
+        mutex_taken = threading.Event()
+        nested_done = threading.Event()
+        
+        def reader():
+            with self.lock.shared():
+                holding.set()
+                mutex_taken.wait()
+                with self.lock.shared():
+                    pass
+                nested_done.set()
+                
+        t = threading.Thread(target=reader)
+        t.start()
+        holding.wait()
+        
+        with self.lock._lock:
+            mutex_taken.set()
+            self.assertTrue(nested_done.wait(timeout=1))
+        
+        t.join()
+        with self.assertRaises(RuntimeError):
+            self.lock.release_shared()
+
+    def test_escalation_restores_nested_depth(self):
+        """Test that escalating from a nested shared hold restores the same depth."""
+        with self.lock.shared():
+            with self.lock.shared():
+                with self.lock.exclusive():
+                    self.assertEqual(self.lock._active_readers, 0)
+                    self.assertEqual(self.lock._active_writers, 1)
+                self.assertEqual(self.lock._shared_count(), 2)
+                self.assertEqual(self.lock._active_readers, 1)
+        
+        self.assertEqual(self.lock._shared_count(), 0)
+        self.assertEqual(self.lock._active_readers, 0)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for Mixtura result filtering.
+
+Tests filter_results_smart for plain, wildcard and --all queries.
+"""
+
+import fnmatch
+
+from mixtura.core.filtering import _compile_glob, filter_results_smart, iter_filter_results_smart
+from mixtura.core.package import Package
+
+
+def _pkgs(*names):
+    return [Package(name=name, provider="nixpkgs", id=name) for name in names]
+
+
+class TestFilterResultsSmart:
+    """Test filter_results_smart."""
+
+    def test_plain_query_keeps_exact_matches(self):
+        """Test a plain query narrows to exact (case-insensitive) name matches."""
+        results = filter_results_smart(_pkgs("vim", "vim-airline", "Vim", "vimwiki"), "vim")
+
+        assert [p.name for p in results] == ["vim", "Vim"]
+
+    def test_plain_query_without_exact_returns_everything(self):
+        """Test a plain query with no exact match leaves results untouched."""
+        packages = _pkgs("neovim", "vim-airline")
+
+        assert filter_results_smart(packages, "vi") == packages
+
+    def test_wildcard_query_matches_glob(self):
+        """Test wildcard queries filter by glob on the name."""
+        packages = _pkgs("neovim-qt", "neovim", "lazy-nvim", "nvim-tree", "telescope-NVIM")
+
+        assert [p.name for p in filter_results_smart(packages, "neovim-*")] == ["neovim-qt"]
+        assert [p.name for p in filter_results_smart(packages, "*-nvim")] == ["lazy-nvim", "telescope-NVIM"]
+
+    def test_wildcard_query_without_literal(self):
+        """Test a pattern with no literal part still matches by glob."""
+        packages = _pkgs("ab", "abc")
+
+        assert [p.name for p in filter_results_smart(packages, "??")] == ["ab"]
+
+    def test_wildcard_classes_follow_fnmatch(self):
+        """Test a "]" opening a class (or after "!") is a member, as in fnmatch."""
+        assert [p.name for p in filter_results_smart(_pkgs("ax", "]x", "bx"), "[]a]x")] == ["ax", "]x"]
+        assert [p.name for p in filter_results_smart(_pkgs("acb", "a]b"), "a[!]]b")] == ["acb"]
+        assert [p.name for p in filter_results_smart(_pkgs("a!", "ax", "a]"), "a[!]x]")] == ["a!"]
+
+    def test_wildcard_prefilter_agrees_with_fnmatch(self):
+        """Test filtering keeps exactly what fnmatch matches, bracket edge cases included."""
+        names = ["ax", "]x", "acb", "a]b", "a[b", "[!]", "vim-x", "v]m"]
+        for pattern in ("[]a]x", "a[!]]b", "a[[]b", "[!]", "v[]i]*", "*[!a-z]*", "a[b"):
+            expected = [n for n in names if fnmatch.fnmatchcase(n, pattern)]
+            assert [p.name for p in filter_results_smart(_pkgs(*names), pattern)] == expected, pattern
+
+    def test_wildcard_pattern_compiled_once(self):
+        """Test repeated filters with the same glob reuse the compiled regex."""
+        _compile_glob.cache_clear()
+        packages = _pkgs("neovim-qt", "neovim")
+
+        filter_results_smart(packages, "neovim-*")
+        filter_results_smart(packages, "NEOVIM-*")
+
+        info = _compile_glob.cache_info()
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_show_all_skips_filtering(self):
+        """Test show_all returns every result."""
+        packages = _pkgs("vim", "vim-airline")
+
+        assert filter_results_smart(packages, "vim", show_all=True) == packages
+
+
+class TestIterFilterResultsSmart:
+    """Test iter_filter_results_smart."""
+
+    def test_exact_matches_stream_and_hold_back_the_rest(self):
+        """Test exact matches are yielded per batch and non-exact ones dropped."""
+        batches = [_pkgs("vim-airline"), _pkgs("vim", "vimwiki"), _pkgs("Vim")]
+
+        yielded = [[p.name for p in group] for group in iter_filter_results_smart(batches, "vim")]
+
+        assert yielded == [["vim"], ["Vim"]]
+
+    def test_no_exact_match_yields_everything_at_the_end(self):
+        """Test held results are released when no batch had an exact match."""
+        batches = [_pkgs("neovim"), [], _pkgs("vim-airline")]
+
+        yielded = [[p.name for p in group] for group in iter_filter_results_smart(batches, "vi")]
+
+        assert yielded == [["neovim", "vim-airline"]]
+
+    def test_matches_non_streaming_filter(self):
+        """Test the yielded groups add up to filter_results_smart over all batches."""
+        batches = [_pkgs("neovim-qt", "lazy-nvim"), _pkgs("neovim", "nvim-tree", "telescope-NVIM")]
+        combined = [p for batch in batches for p in batch]
+
+        for query, show_all in (("*-nvim", False), ("neovim", False), ("nvim", True)):
+            streamed = [p for group in iter_filter_results_smart(batches, query, show_all) for p in group]
+            assert streamed == filter_results_smart(combined, query, show_all)
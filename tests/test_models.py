@@ -1,6 +1,6 @@
 
 import pytest
-from mixtura.core.package import PackageSpec
+from mixtura.core.package import Package, PackageSpec
 
 class TestPackageSpec:
     def test_parse_simple_package(self):
@@ -26,7 +26,31 @@ class TestPackageSpec:
         assert spec.name == "com.spotify.Client"
         assert spec.provider == "flatpak"
 
+    def test_parse_bare_name_keeps_input(self):
+        spec = PackageSpec.parse("python3.12")
+        assert spec.name == "python3.12"
+        assert spec.provider is None
+
+    def test_parse_strips_around_separator(self):
+        spec = PackageSpec.parse(" homebrew # wget ")
+        assert spec.name == "wget"
+        assert spec.provider == "homebrew"
+
     def test_parse_invalid(self):
         # Empty string behavior
         with pytest.raises(ValueError):
             PackageSpec.parse("")
+
+
+class TestPackage:
+    def test_dict_round_trip_without_extra(self):
+        pkg = Package(name="git", provider="nixpkgs", id="git", version="2.43.0")
+        restored = Package.from_dict(pkg.to_dict())
+        assert restored == pkg
+        assert restored.extra == {}
+
+    def test_dict_round_trip_keeps_extra(self):
+        pkg = Package(name="vim", provider="homebrew", id="vim", extra={"tap": "homebrew/core"})
+        data = pkg.to_dict()
+        assert data["tap"] == "homebrew/core"
+        assert Package.from_dict(data).extra == {"tap": "homebrew/core"}
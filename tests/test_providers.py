@@ -4,13 +4,22 @@ Tests for Mixtura package providers.
 Tests provider implementations for Nix, Flatpak, and Homebrew.
 """
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+from mixtura.cache import SearchCache
 from mixtura.core.package import Package
 from mixtura.core.providers.nixpkgs.provider import NixProvider
 from mixtura.core.providers.flatpak.provider import FlatpakProvider
 from mixtura.core.providers.homebrew.provider import HomebrewProvider
-from mixtura.core.providers import get_all_providers, get_default_provider_name
+from mixtura.utils import CommandError
+from mixtura.core import providers as providers_module
+from mixtura.core.providers import (
+    get_all_providers,
+    get_available_providers,
+    get_default_provider_name,
+    invalidate_availability_cache,
+    warm_providers,
+)
 
 
 class TestNixProvider:
@@ -35,6 +44,20 @@ class TestNixProvider:
         
         assert provider.is_available() is False
     
+    @patch('shutil.which')
+    def test_is_available_is_memoized(self, mock_which):
+        """Test availability is probed once until refresh_availability is called."""
+        mock_which.return_value = "/nix/bin/nix"
+        
+        provider = NixProvider()
+        assert provider.is_available() is True
+        mock_which.return_value = None
+        assert provider.is_available() is True
+        mock_which.assert_called_once()
+        
+        provider.refresh_availability()
+        assert provider.is_available() is False
+    
     def test_name_property(self):
         """Test provider name is 'nixpkgs'."""
         provider = NixProvider()
@@ -54,6 +77,41 @@ class TestNixProvider:
         call_args = mock_run.call_args[0][0]
         assert "nixpkgs#git" in call_args
     
+    @patch('shutil.which')
+    @patch('mixtura.core.providers.nixpkgs.provider.run')
+    def test_install_batches_packages(self, mock_run, mock_which):
+        """Test that install runs a single nix profile add for all packages."""
+        mock_which.return_value = "/nix/bin/nix"
+        
+        NixProvider().install(["git", "github:owner/repo#tool"])
+        
+        mock_run.assert_called_once_with(
+            ["nix", "profile", "add", "--impure", "nixpkgs#git", "github:owner/repo#tool"]
+        )
+    
+    def test_install_keys_match_profile_elements(self):
+        """Test search IDs and profile elements normalize to the same install key."""
+        provider = NixProvider()
+        installed = Package(
+            name="hello", provider="nixpkgs", id="hello", installed=True,
+            extra={"attrPath": "legacyPackages.x86_64-linux.hello", "originalUrl": "flake:nixpkgs"},
+        )
+        
+        key = provider.installed_key(installed)
+        assert provider.install_key("legacyPackages.x86_64-linux.hello") == key
+        assert provider.install_key("hello") == key
+        assert provider.install_key("nixpkgs#hello") == key
+        assert provider.install_key("github:owner/repo#hello") != key
+
+    @patch.object(NixProvider, 'installed_signature', return_value="/nix/store/new-profile")
+    def test_installed_snapshot_never_lists_live(self, mock_signature, tmp_path, monkeypatch):
+        """Test installed_snapshot returns None instead of running `nix profile list`."""
+        monkeypatch.setattr(SearchCache, "CACHE_DIR", tmp_path)
+        
+        with patch('mixtura.core.providers.nixpkgs.provider.run_capture') as mock_capture:
+            assert NixProvider().installed_snapshot() is None
+        mock_capture.assert_not_called()
+
     @patch('mixtura.core.providers.nixpkgs.provider.SearchCache')
     @patch('shutil.which')
     @patch('mixtura.core.providers.nixpkgs.provider.run_capture')
@@ -73,6 +131,74 @@ class TestNixProvider:
         assert results[0].provider == "nixpkgs"
 
 
+    @patch('mixtura.core.providers.nixpkgs.provider.SearchCache')
+    @patch('shutil.which')
+    @patch('mixtura.core.providers.nixpkgs.provider.run_capture')
+    def test_search_without_cache_still_refreshes_it(self, mock_capture, mock_which, mock_cache):
+        """Test use_cache=False skips cached entries but stores the fresh result."""
+        mock_which.return_value = "/nix/bin/nix"
+        mock_capture.return_value = (0, '{"legacyPackages.x86_64-linux.git": {"version": "2.43.0", "description": ""}}', '')
+        mock_cache.return_value.get.return_value = [Package(name="stale", provider="nixpkgs", id="stale")]
+        
+        results = NixProvider().search("git", use_cache=False)
+        
+        mock_cache.return_value.get.assert_not_called()
+        mock_cache.return_value.set.assert_called_once_with("git", results)
+        assert [p.name for p in results] == ["git"]
+
+    @patch('mixtura.core.providers.nixpkgs.provider.SearchCache')
+    @patch('shutil.which')
+    @patch('mixtura.core.providers.nixpkgs.provider.run_capture')
+    def test_search_many_runs_one_nix_search(self, mock_capture, mock_which, mock_cache):
+        """Test several queries share one `nix search` and are split back per query."""
+        mock_which.return_value = "/nix/bin/nix"
+        mock_capture.return_value = (0, (
+            '{"legacyPackages.x86_64-linux.git": {"version": "2.43.0", "description": "Version control"},'
+            ' "legacyPackages.x86_64-linux.vim": {"version": "9.1", "description": "Text editor"}}'
+        ), '')
+        mock_cache.return_value.get.return_value = None
+        
+        provider = NixProvider()
+        results = provider.search_many(["git", "editor"])
+        
+        mock_capture.assert_called_once()
+        assert mock_capture.call_args[0][0][3] == "(git)|(editor)"
+        assert [p.name for p in results["git"]] == ["git"]
+        assert [p.name for p in results["editor"]] == ["vim"]
+
+    @patch('mixtura.core.providers.nixpkgs.provider.SearchCache')
+    @patch('shutil.which')
+    @patch('mixtura.core.providers.nixpkgs.provider.run_capture')
+    def test_search_many_matches_like_nix(self, mock_capture, mock_which, mock_cache):
+        """Test batched results are split on the full attribute path and derivation name too."""
+        mock_which.return_value = "/nix/bin/nix"
+        mock_capture.return_value = (0, (
+            '{"legacyPackages.x86_64-linux.python312Packages.requests":'
+            ' {"pname": "python3.12-requests", "version": "2.31", "description": "HTTP library"},'
+            ' "legacyPackages.x86_64-linux.vim": {"pname": "vim", "version": "9.1", "description": null}}'
+        ), '')
+        mock_cache.return_value.get.return_value = None
+        
+        results = NixProvider().search_many(["python3.12-req", "python312Packages", "VIM"])
+        
+        assert [p.name for p in results["python3.12-req"]] == ["requests"]
+        assert [p.name for p in results["python312Packages"]] == ["requests"]
+        assert [p.name for p in results["VIM"]] == ["vim"]
+
+    @patch('mixtura.core.providers.nixpkgs.provider.SearchCache')
+    @patch('shutil.which')
+    @patch('mixtura.core.providers.nixpkgs.provider.run_capture')
+    def test_search_timeout_returns_no_results(self, mock_capture, mock_which, mock_cache, monkeypatch):
+        """Test a search that runs past MIXTURA_PROVIDER_TIMEOUT yields nothing instead of hanging."""
+        monkeypatch.setenv("MIXTURA_PROVIDER_TIMEOUT", "30")
+        mock_which.return_value = "/nix/bin/nix"
+        mock_capture.side_effect = CommandError("Command timed out after 30s", returncode=124)
+        mock_cache.return_value.get.return_value = None
+        
+        assert NixProvider().search("git") == []
+        assert mock_capture.call_args.kwargs["timeout"] == 30
+
+
 class TestFlatpakProvider:
     """Test Flatpak provider."""
     
@@ -103,7 +229,8 @@ class TestFlatpakProvider:
     
     @patch('shutil.which')
     @patch('mixtura.core.providers.flatpak.provider.run_capture')
-    def test_list_packages_parses_output(self, mock_capture, mock_which):
+    @patch.object(FlatpakProvider, 'installed_signature', return_value=None)
+    def test_list_packages_parses_output(self, mock_signature, mock_capture, mock_which):
         """Test list_packages parses flatpak list output."""
         mock_which.return_value = "/usr/bin/flatpak"
         mock_capture.return_value = (0, 'Firefox\torg.mozilla.firefox\tBrowser\t121.0', '')
@@ -116,10 +243,57 @@ class TestFlatpakProvider:
         assert results[0].id == "org.mozilla.firefox"
         assert results[0].provider == "flatpak"
 
+    @patch('shutil.which')
+    @patch('mixtura.core.providers.flatpak.provider.run_capture')
+    def test_list_packages_reuses_snapshot_until_signature_changes(self, mock_capture, mock_which, tmp_path, monkeypatch):
+        """Test list_packages is served from disk while the installed signature holds."""
+        monkeypatch.setattr(SearchCache, "CACHE_DIR", tmp_path)
+        mock_which.return_value = "/usr/bin/flatpak"
+        mock_capture.return_value = (0, 'Firefox\torg.mozilla.firefox\tBrowser\t121.0', '')
+        signature = MagicMock(return_value="sig-1")
+        monkeypatch.setattr(FlatpakProvider, "installed_signature", signature)
+        
+        first = FlatpakProvider().list_packages()
+        second = FlatpakProvider().list_packages()
+        assert mock_capture.call_count == 1
+        assert [p.id for p in first] == [p.id for p in second] == ["org.mozilla.firefox"]
+        assert second[0].version == "121.0"
+        
+        signature.return_value = "sig-2"
+        FlatpakProvider().list_packages()
+        assert mock_capture.call_count == 2
+
 
 class TestHomebrewProvider:
     """Test Homebrew provider."""
     
+    def test_search_many_respects_max_workers(self, monkeypatch):
+        """Test the default search_many never runs more searches at once than MAX_WORKERS."""
+        import threading
+        import time
+        from mixtura.core import service as service_module
+        
+        monkeypatch.setattr(service_module, "MAX_WORKERS", 1)
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        
+        def fake_search(query):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return [Package(name=query, provider="homebrew", id=query)]
+        
+        provider = HomebrewProvider()
+        monkeypatch.setattr(provider, "search", fake_search)
+        results = provider.search_many(["a", "b", "c", "d"])
+        
+        assert peak[0] == 1
+        assert [p.name for p in results["c"]] == ["c"]
+    
     @patch('shutil.which')
     def test_is_available_when_installed(self, mock_which):
         """Test is_available returns True when brew is installed."""
@@ -162,6 +336,52 @@ class TestProviderLoading:
         # Should have at least these providers registered (even if not available)
         assert "nixpkgs" in providers or len(providers) >= 0  # May be empty if import fails
     
+    def test_get_available_providers_probes_once(self, monkeypatch):
+        """Test availability is probed once and reused across calls."""
+        mock_nix = MagicMock()
+        mock_nix.is_available.return_value = True
+        mock_brew = MagicMock()
+        mock_brew.is_available.return_value = False
+        monkeypatch.setattr(providers_module, "_loaded", True)
+        monkeypatch.setattr(providers_module, "_providers_cache", {"nixpkgs": mock_nix, "homebrew": mock_brew})
+        monkeypatch.setattr(providers_module, "_available_cache", None)
+        
+        first = get_available_providers()
+        second = get_available_providers()
+        
+        assert list(first) == list(second) == ["nixpkgs"]
+        assert first is not second
+        mock_nix.is_available.assert_called_once()
+        mock_brew.is_available.assert_called_once()
+    
+    def test_invalidate_availability_cache_reprobes(self, monkeypatch):
+        """Test invalidation drops the memoized result and refreshes providers."""
+        mock_nix = MagicMock()
+        mock_nix.is_available.return_value = True
+        monkeypatch.setattr(providers_module, "_loaded", True)
+        monkeypatch.setattr(providers_module, "_providers_cache", {"nixpkgs": mock_nix})
+        monkeypatch.setattr(providers_module, "_available_cache", None)
+        
+        get_available_providers()
+        invalidate_availability_cache()
+        mock_nix.is_available.return_value = False
+        
+        assert get_available_providers() == {}
+        mock_nix.refresh_availability.assert_called_once()
+    
+    def test_warm_providers_fills_availability_cache(self, monkeypatch):
+        """Test the warm-up thread leaves the availability result ready."""
+        mock_nix = MagicMock()
+        mock_nix.is_available.return_value = True
+        monkeypatch.setattr(providers_module, "_loaded", True)
+        monkeypatch.setattr(providers_module, "_providers_cache", {"nixpkgs": mock_nix})
+        monkeypatch.setattr(providers_module, "_available_cache", None)
+        
+        warm_providers().join(timeout=5)
+        
+        assert list(get_available_providers()) == ["nixpkgs"]
+        mock_nix.is_available.assert_called_once()
+    
     def test_get_default_provider_name(self):
         """Test get_default_provider_name returns a string."""
         default = get_default_provider_name()
@@ -235,3 +455,12 @@ class TestPackageDataclass:
         assert "nixpkgs" in s
         assert "9.1.0" in s
 
+    
+    def test_package_name_lower_is_cached(self):
+        """Test name_lower is computed once and kept out of to_dict/equality."""
+        pkg = Package(name="Spotify", provider="flatpak", id="com.spotify.Client")
+        
+        assert pkg.name_lower == "spotify"
+        assert pkg.name_lower is pkg.name_lower
+        assert "name_lower" not in pkg.to_dict()
+        assert pkg == Package(name="Spotify", provider="flatpak", id="com.spotify.Client")
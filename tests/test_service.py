@@ -1,15 +1,16 @@
 
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import MagicMock, patch
+from mixtura.core import service as service_module
 from mixtura.core.service import PackageService
 from mixtura.core.package import Package, PackageSpec
 
 class TestPackageService:
-    @pytest.fixture
-    def mock_providers(self):
-        with patch('mixtura.core.service.get_all_providers') as mock:
-            yield mock
-
     @pytest.fixture
     def mock_available(self):
         with patch('mixtura.core.service.get_available_providers') as mock:
@@ -30,7 +31,76 @@ class TestPackageService:
         
         assert len(results) == 1
         assert results[0].name == "git"
-        mock_nix.search.assert_called_with("git")
+        mock_nix.search.assert_called_with("git", True)
+
+    def test_search_drops_duplicate_packages(self, mock_available):
+        mock_nix = MagicMock()
+        mock_nix.search.return_value = [
+            Package("foo", "nixpkgs", "python311Packages.foo"),
+            Package("foo", "nixpkgs", "python312Packages.foo"),
+            Package("foo", "nixpkgs", "python311Packages.foo"),
+        ]
+        mock_available.return_value = {"nixpkgs": mock_nix}
+        
+        results = PackageService().search("foo")
+        
+        assert [p.id for p in results] == ["python311Packages.foo", "python312Packages.foo"]
+
+    def test_iter_search_yields_each_provider_batch(self, mock_available):
+        mock_nix = MagicMock()
+        mock_nix.search.return_value = [Package("git", "nixpkgs", "git")]
+        mock_flatpak = MagicMock()
+        mock_flatpak.search.return_value = []
+        mock_brew = MagicMock()
+        mock_brew.search.return_value = [Package("git", "homebrew", "git")]
+        mock_available.return_value = {"nixpkgs": mock_nix, "flatpak": mock_flatpak, "homebrew": mock_brew}
+        
+        service = PackageService()
+        batches = list(service.iter_search("git"))
+        
+        # Empty batches are skipped
+        assert sorted(b[0].provider for b in batches) == ["homebrew", "nixpkgs"]
+        assert all(len(b) == 1 for b in batches)
+        mock_nix.search.assert_called_once()
+
+    def test_search_always_asks_providers(self, mock_available):
+        mock_nix = MagicMock()
+        mock_nix.search.return_value = [Package("git", "nixpkgs", "git")]
+        mock_available.return_value = {"nixpkgs": mock_nix}
+        
+        service = PackageService()
+        service.search("git")
+        service.search("git")
+        
+        assert mock_nix.search.call_count == 2
+
+    def test_search_many_sends_batch_to_each_provider(self, mock_available):
+        mock_nix = MagicMock()
+        mock_nix.search_many.return_value = {"git": [Package("git", "nixpkgs", "git")], "vim": []}
+        mock_flatpak = MagicMock()
+        mock_flatpak.search_many.return_value = {"git": [], "vim": [Package("vim", "flatpak", "org.vim.Vim")]}
+        mock_available.return_value = {"nixpkgs": mock_nix, "flatpak": mock_flatpak}
+        
+        service = PackageService()
+        results = service.search_many(["git", "vim", "git"])
+        
+        mock_nix.search_many.assert_called_once_with(["git", "vim"])
+        mock_flatpak.search_many.assert_called_once_with(["git", "vim"])
+        assert [p.provider for p in results["git"]] == ["nixpkgs"]
+        assert [p.provider for p in results["vim"]] == ["flatpak"]
+
+    def test_list_installed_isolates_failing_provider(self, mock_available):
+        broken = MagicMock()
+        broken.list_packages.side_effect = RuntimeError("boom")
+        working = MagicMock()
+        working.list_packages.return_value = [Package("vim", "flatpak", "org.vim.Vim")]
+        mock_available.return_value = {"nixpkgs": broken, "flatpak": working}
+        
+        installed = PackageService().list_installed()
+        
+        assert installed["nixpkgs"] == []
+        assert [p.id for p in installed["flatpak"]] == ["org.vim.Vim"]
+        broken.list_packages.assert_called_once()
 
     def test_install_specific(self, mock_get_provider):
         mock_nix = MagicMock()
@@ -46,6 +116,56 @@ class TestPackageService:
         assert results[0].provider == "nixpkgs"
         mock_nix.install.assert_called_with(["vim"])
 
+    def test_install_deduplicates_per_provider(self, mock_get_provider):
+        mock_nix = MagicMock()
+        mock_nix.is_available.return_value = True
+        mock_get_provider.return_value = mock_nix
+        
+        service = PackageService()
+        service.install([PackageSpec("git", "nixpkgs"), PackageSpec("vim", "nixpkgs"), PackageSpec("git", "nixpkgs")])
+        
+        mock_nix.install.assert_called_once_with(["git", "vim"])
+
+    def test_install_skips_already_installed(self, mock_get_provider):
+        mock_flatpak = MagicMock()
+        mock_flatpak.is_available.return_value = True
+        mock_flatpak.installed_snapshot.return_value = [Package("Firefox", "flatpak", "org.mozilla.firefox")]
+        mock_flatpak.install_key.side_effect = lambda name: name
+        mock_flatpak.installed_key.side_effect = lambda pkg: pkg.id
+        mock_get_provider.return_value = mock_flatpak
+        
+        results = PackageService().install([
+            PackageSpec("org.mozilla.firefox", "flatpak"), PackageSpec("org.gimp.GIMP", "flatpak")
+        ])
+        
+        mock_flatpak.install.assert_called_once_with(["org.gimp.GIMP"])
+        assert results[0].message == "Successfully installed: org.gimp.GIMP (already installed: org.mozilla.firefox)"
+
+    def test_install_nothing_when_all_installed(self, mock_get_provider):
+        mock_flatpak = MagicMock()
+        mock_flatpak.is_available.return_value = True
+        mock_flatpak.installed_snapshot.return_value = [Package("Firefox", "flatpak", "org.mozilla.firefox")]
+        mock_flatpak.install_key.side_effect = lambda name: name
+        mock_flatpak.installed_key.side_effect = lambda pkg: pkg.id
+        mock_get_provider.return_value = mock_flatpak
+        
+        results = PackageService().install([PackageSpec("org.mozilla.firefox", "flatpak")])
+        
+        mock_flatpak.install.assert_not_called()
+        assert results[0].success is True
+        assert results[0].message == "Already installed: org.mozilla.firefox"
+
+    def test_install_without_snapshot_does_not_list(self, mock_get_provider):
+        mock_brew = MagicMock()
+        mock_brew.is_available.return_value = True
+        mock_brew.installed_snapshot.return_value = None
+        mock_get_provider.return_value = mock_brew
+        
+        PackageService().install([PackageSpec("wget", "homebrew")])
+        
+        mock_brew.list_packages.assert_not_called()
+        mock_brew.install.assert_called_once_with(["wget"])
+
     def test_install_missing_provider(self, mock_get_provider):
         service = PackageService()
         specs = [PackageSpec("vim", None)]
@@ -54,3 +174,93 @@ class TestPackageService:
         assert len(results) == 1
         assert results[0].success is False
         assert "Provider not specified" in results[0].message
+
+    def test_operations_share_bounded_executor(self, mock_available):
+        mock_available.return_value = {}
+        
+        first = service_module._get_executor()
+        PackageService().search("git")
+        
+        assert service_module._get_executor() is first
+        assert first._max_workers == service_module.MAX_WORKERS
+
+    def test_clean_runs_each_provider_and_reports_failures(self, mock_get_provider):
+        mock_nix = MagicMock()
+        mock_nix.is_available.return_value = True
+        mock_brew = MagicMock()
+        mock_brew.is_available.return_value = True
+        mock_brew.clean.side_effect = RuntimeError("brew broke")
+        mock_get_provider.side_effect = {"nixpkgs": mock_nix, "homebrew": mock_brew}.get
+        
+        results = PackageService().clean(["nixpkgs", "homebrew", "flatpak"])
+        
+        mock_nix.clean.assert_called_once()
+        mock_brew.clean.assert_called_once()
+        outcome = {r.provider: (r.success, r.message) for r in results}
+        assert outcome["nixpkgs"] == (True, "Cleaned")
+        assert outcome["homebrew"] == (False, "brew broke")
+        assert outcome["flatpak"][0] is False
+
+    def test_max_workers_env_override(self, monkeypatch):
+        monkeypatch.setenv("MIXTURA_MAX_WORKERS", "3")
+        assert service_module._max_workers() == 3
+        
+        for invalid in ("0", "many"):
+            monkeypatch.setenv("MIXTURA_MAX_WORKERS", invalid)
+            assert service_module._max_workers() >= 2
+
+    def test_upgrade_reports_each_task_own_packages(self, mock_available, mock_get_provider):
+        mock_nix = MagicMock()
+        mock_nix.name = "nixpkgs"
+        mock_brew = MagicMock()
+        mock_brew.name = "homebrew"
+        mock_available.return_value = {"nixpkgs": mock_nix, "homebrew": mock_brew}
+        mock_get_provider.side_effect = {"nixpkgs": mock_nix, "homebrew": mock_brew}.get
+        
+        results = PackageService().upgrade([PackageSpec("nixpkgs"), PackageSpec("wget", "homebrew")])
+        
+        messages = {r.provider: r.message for r in results}
+        assert messages == {"nixpkgs": "Upgrade successful", "homebrew": "Upgraded 1 packages"}
+
+    def test_upgrade_coalesces_duplicate_providers(self, mock_available, mock_get_provider):
+        mock_nix = MagicMock()
+        mock_nix.name = "nixpkgs"
+        mock_available.return_value = {"nixpkgs": mock_nix}
+        mock_get_provider.return_value = mock_nix
+        
+        specs = [PackageSpec("nixpkgs"), PackageSpec("foo", "nixpkgs"), PackageSpec("nixpkgs")]
+        results = PackageService().upgrade(specs)
+        
+        mock_nix.upgrade.assert_called_once_with(None)
+        assert [r.message for r in results] == ["Upgrade successful"]
+
+    def test_upgrade_reports_unavailable_provider(self, mock_available, mock_get_provider):
+        mock_available.return_value = {}
+        mock_get_provider.return_value = None
+        
+        results = PackageService().upgrade([PackageSpec("wget", "homebrew")])
+        
+        assert [(r.provider, r.success) for r in results] == [("homebrew", False)]
+        assert "not available" in results[0].message
+
+
+def test_cli_import_defers_concurrent_futures():
+    code = "import sys, mixtura.cli; print('concurrent.futures' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    
+    assert out.stdout.strip() == "False"
+
+
+def test_completed_cancels_queued_futures_on_interrupt():
+    gate = threading.Event()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        first = pool.submit(lambda: None)
+        blocker = pool.submit(gate.wait)
+        queued = pool.submit(lambda: "never")
+        
+        with pytest.raises(KeyboardInterrupt):
+            for _ in service_module._completed([first, blocker, queued]):
+                raise KeyboardInterrupt
+        gate.set()
+    
+    assert queued.cancelled()
@@ -148,6 +148,32 @@ class TestDisplayFunctions:
         # Should have printed multiple times (title, package info)
         assert mock_console.print.call_count >= 2
     
+    @patch('mixtura.ui.display.console')
+    def test_display_package_list_prints_once(self, mock_console):
+        """Test display_package_list writes the whole listing in one call."""
+        packages = [
+            Package(name="git", provider="nixpkgs", id="git", version="2.43.0", description="VCS"),
+            Package(name="vim", provider="nixpkgs", id="vim", version="9.1.0", description="Editor"),
+        ]
+        
+        display_package_list(packages, "Test Results")
+        
+        # Blank spacer line, then everything else in a single print
+        assert mock_console.print.call_count == 2
+        body = mock_console.print.call_args.args[0]
+        assert "git" in body and "vim" in body and "Editor" in body
+    
+    @patch('mixtura.ui.display.console')
+    def test_display_package_list_continues_numbering(self, mock_console):
+        """Test a continuation batch skips the header and keeps counting."""
+        packages = [Package(name="vim", provider="flatpak", id="org.vim.Vim", version="9.1.0")]
+        
+        display_package_list(packages, "Test Results", start=3)
+        
+        mock_console.print.assert_called_once()
+        body = mock_console.print.call_args.args[0]
+        assert "3." in body and "Test Results" not in body
+    
     @patch('mixtura.ui.display.console')
     def test_display_installed_packages(self, mock_console):
         """Test display_installed_packages outputs package list."""
@@ -160,9 +186,9 @@ class TestDisplayFunctions:
         assert mock_console.print.call_count >= 1
     
     @patch('mixtura.ui.display.console')
+    @patch('mixtura.ui.display.err_console')
     @patch('mixtura.ui.display.log_success')
-    @patch('mixtura.ui.display.log_error')
-    def test_display_operation_results_success(self, mock_error, mock_success, mock_console):
+    def test_display_operation_results_success(self, mock_success, mock_err_console, mock_console):
         """Test display_operation_results with all successes."""
         results = [
             ("nixpkgs", True, "Installed 2 packages"),
@@ -171,14 +197,16 @@ class TestDisplayFunctions:
         
         display_operation_results(results)
         
-        # Should log success for each result and final success
-        assert mock_success.call_count >= 2
+        # All result lines go out in a single write, then the final success
+        block = mock_console.print.call_args_list[-1].args[0]
+        assert "Installed 2 packages" in block and "Installed 1 package" in block
+        mock_err_console.print.assert_not_called()
+        mock_success.assert_called_once()
     
     @patch('mixtura.ui.display.console')
-    @patch('mixtura.ui.display.log_success')
-    @patch('mixtura.ui.display.log_error')
+    @patch('mixtura.ui.display.err_console')
     @patch('mixtura.ui.display.log_warn')
-    def test_display_operation_results_with_errors(self, mock_warn, mock_error, mock_success, mock_console):
+    def test_display_operation_results_with_errors(self, mock_warn, mock_err_console, mock_console):
         """Test display_operation_results with some errors."""
         results = [
             ("nixpkgs", True, "Installed 2 packages"),
@@ -187,9 +215,11 @@ class TestDisplayFunctions:
         
         display_operation_results(results)
         
-        # Should log success for first, error for second, warn at end
-        mock_success.assert_called()
-        mock_error.assert_called()
+        # Success lines on stdout, error lines on stderr, warn at end
+        assert "Installed 2 packages" in mock_console.print.call_args_list[-1].args[0]
+        mock_err_console.print.assert_called_once()
+        assert "Failed to install" in mock_err_console.print.call_args.args[0]
+        mock_warn.assert_called_once()
 
 
 class TestPrompts:
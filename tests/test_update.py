@@ -6,10 +6,12 @@ Tests the update checking functionality.
 
 
 from unittest.mock import patch, MagicMock, mock_open
+import os
 import sys
 import json
+import time
 
-from mixtura.update import is_nuitka_compiled, check_for_updates
+from mixtura.update import is_nuitka_compiled, check_for_updates, update_check_due, mark_update_checked
 
 
 class TestIsNuitkaCompiled:
@@ -45,6 +47,28 @@ class TestIsNuitkaCompiled:
                 sys.frozen = original_frozen
 
 
+class TestUpdateCheckStamp:
+    """Test the once-a-day gate for the startup update check."""
+    
+    def test_due_without_stamp(self, update_stamp):
+        """Test a check is due when no stamp exists yet."""
+        assert not update_stamp.exists()
+        assert update_check_due() is True
+    
+    def test_not_due_after_mark(self, update_stamp):
+        """Test a fresh stamp suppresses the next check."""
+        mark_update_checked()
+        assert update_stamp.exists()
+        assert update_check_due() is False
+    
+    def test_due_after_interval(self, update_stamp):
+        """Test an old stamp makes the check due again."""
+        mark_update_checked()
+        old = time.time() - 2 * 24 * 60 * 60
+        os.utime(update_stamp, (old, old))
+        assert update_check_due() is True
+
+
 class TestCheckForUpdates:
     """Test update checking functionality."""
     
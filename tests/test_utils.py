@@ -7,8 +7,9 @@ Tests the command execution utilities and error handling.
 import pytest
 from unittest.mock import patch, MagicMock
 import subprocess
+import sys
 
-from mixtura.utils import run, run_capture, CommandError
+from mixtura.utils import query_timeout, run, run_capture, CommandError
 
 
 class TestCommandError:
@@ -25,6 +26,26 @@ class TestCommandError:
         assert isinstance(error, Exception)
 
 
+class TestQueryTimeout:
+    """Test query_timeout function."""
+
+    def test_unset_means_no_limit(self, monkeypatch):
+        """Test that queries have no timeout by default."""
+        monkeypatch.delenv("MIXTURA_PROVIDER_TIMEOUT", raising=False)
+        assert query_timeout() is None
+
+    def test_reads_seconds_from_env(self, monkeypatch):
+        """Test that MIXTURA_PROVIDER_TIMEOUT sets the timeout."""
+        monkeypatch.setenv("MIXTURA_PROVIDER_TIMEOUT", "30")
+        assert query_timeout() == 30
+
+    @pytest.mark.parametrize("value", ["abc", "0", "-5", ""])
+    def test_invalid_values_mean_no_limit(self, monkeypatch, value):
+        """Test that invalid or non-positive values are ignored."""
+        monkeypatch.setenv("MIXTURA_PROVIDER_TIMEOUT", value)
+        assert query_timeout() is None
+
+
 class TestRunCapture:
     """Test run_capture function."""
     
@@ -154,6 +175,34 @@ class TestRun:
         # Console should have been called to print the command
         assert mock_console.print.called
     
+    def test_run_check_warnings_relays_output(self, capsys):
+        """Test check_warnings still shows the command's output."""
+        script = "import sys; print('building'); print('note', file=sys.stderr)"
+        
+        run([sys.executable, "-c", script], silent=True, check_warnings=True)
+        
+        captured = capsys.readouterr()
+        assert captured.out == "building\n"
+        assert captured.err == "note\n"
+    
+    @patch('mixtura.utils.log_info')
+    @patch('mixtura.utils.log_error')
+    def test_run_check_warnings_detects_stderr_pattern(self, mock_error, mock_info):
+        """Test warning patterns on stderr fail the command even with exit code 0."""
+        script = "import sys; print('error: No packages to remove', file=sys.stderr)"
+        
+        with pytest.raises(CommandError):
+            run([sys.executable, "-c", script], silent=True, check_warnings=True, show_output=False)
+    
+    @patch('mixtura.utils.log_info')
+    @patch('mixtura.utils.log_error')
+    def test_run_check_warnings_timeout(self, mock_error, mock_info):
+        """Test a streamed command is killed once it exceeds the timeout."""
+        with pytest.raises(CommandError) as exc_info:
+            run([sys.executable, "-c", "import time; time.sleep(10)"], silent=True, check_warnings=True, timeout=1)
+        
+        assert exc_info.value.returncode == 124
+    
     def test_run_rejects_string_command(self):
         """Test run rejects string commands for security."""
         # Should raise TypeError or similar for string commands